@@ -16,6 +16,7 @@ from datetime import datetime
 from flask import Flask, session, render_template, jsonify
 from dotenv import load_dotenv
 import werkzeug
+from sqlalchemy.pool import StaticPool
 
 from extensions import db, migrate, cache
 from models import (  # noqa: F401
@@ -29,7 +30,7 @@ from models import (  # noqa: F401
 )
 
 # Import our refactored services and blueprints
-from services import init_services
+from services import init_services, get_data_service, get_progress_service
 from blueprints import register_blueprints, get_blueprint_info
 
 # Load environment variables
@@ -46,6 +47,9 @@ def _normalize_sqlite_uri(uri: str, base_dir: str) -> str:
     if not uri or not uri.startswith("sqlite:///"):
         return uri
     raw_path = uri.replace("sqlite:///", "", 1)
+    # SQLite URI filenames (e.g. in-memory "file:name?mode=memory") are not paths.
+    if raw_path.startswith("file:"):
+        return uri
     # If already absolute (drive letter or leading slash), leave as-is.
     if os.path.isabs(raw_path) or re.match(r"^[A-Za-z]:[\\/]", raw_path):
         return uri
@@ -58,6 +62,30 @@ os.makedirs(app.instance_path, exist_ok=True)
 raw_db_uri = os.getenv("DATABASE_URL", f"sqlite:///{default_db_path.replace(os.sep, '/')}")
 app.config["SQLALCHEMY_DATABASE_URI"] = _normalize_sqlite_uri(raw_db_uri, app.root_path)
 app.config.setdefault("SQLALCHEMY_TRACK_MODIFICATIONS", False)
+
+
+def _engine_options(uri: str) -> dict:
+    uri = uri or ""
+    options = {
+        "pool_pre_ping": True,
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+    # An in-memory SQLite database lives only as long as its connection, so
+    # every checkout must share the one connection.
+    if uri == "sqlite://" or ":memory:" in uri or "mode=memory" in uri:
+        options["poolclass"] = StaticPool
+        options["connect_args"] = {"check_same_thread": False}
+    # SQLite pools are managed by the driver setup; only size server pools.
+    if not uri.startswith("sqlite"):
+        options["pool_size"] = int(os.getenv("DB_POOL_SIZE", "10"))
+        options["max_overflow"] = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    return options
+
+
+app.config.setdefault(
+    "SQLALCHEMY_ENGINE_OPTIONS",
+    _engine_options(app.config["SQLALCHEMY_DATABASE_URI"]),
+)
 app.config.setdefault("TEMPLATES_AUTO_RELOAD", True)
 
 # Initialize extensions
@@ -82,6 +110,7 @@ DATA_ROOT_PATH = os.path.join(os.path.dirname(__file__), "data")
 # Initialize services with data path
 print("[*] Initializing services...")
 init_services(DATA_ROOT_PATH)
+get_progress_service().init_app(app)
 print("[+] Services initialized successfully")
 
 # Register all blueprints
@@ -292,6 +321,13 @@ if __name__ == "__main__":
     print(f"[DATA] Data root path: {DATA_ROOT_PATH}")
     print(f"[SECRET] Secret key configured: {'Yes' if app.secret_key else 'No'}")
     print(f"[AI] OpenAI configured: {'Yes' if os.getenv('OPENAI_API_KEY') else 'No'}")
+
+    # Preload subject data so first requests skip the filesystem. Only done
+    # when serving, not on every import (tests, flask db, migrations).
+    # Set PRELOAD_SUBJECT_DATA=0 to disable.
+    if os.getenv("PRELOAD_SUBJECT_DATA", "1") != "0":
+        preloaded = get_data_service().data_loader.warm_cache()
+        print(f"[+] Preloaded {preloaded} subject data files")
     print("\\n" + "=" * 50)
     print("Application ready! [READY]")
     print("=" * 50)
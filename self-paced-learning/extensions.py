@@ -1,9 +1,27 @@
 """Application extensions."""
 
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session as _FlaskSession
 from flask_migrate import Migrate
 from flask_caching import Cache
+from sqlalchemy.engine import Connection
 
-db = SQLAlchemy()
+
+class Session(_FlaskSession):
+    """Session that honours an explicit connection bind.
+
+    Flask-SQLAlchemy always resolves the app engine, so
+    ``db.session.configure(bind=connection)`` would otherwise be ignored.
+    Binding to a connection lets callers (e.g. tests) join an outer
+    transaction.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and isinstance(self.bind, Connection):
+            return self.bind
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={"class_": Session})
 migrate = Migrate()
 cache = Cache()
@@ -0,0 +1,78 @@
+"""add user is_admin flag
+
+Revision ID: 4a7d2e9c5b13
+Revises: 6f3c1a2b9d7e
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+import json
+import logging
+import os
+
+from alembic import op
+import sqlalchemy as sa
+from flask import current_app
+
+
+# revision identifiers, used by Alembic.
+revision = "4a7d2e9c5b13"
+down_revision = "6f3c1a2b9d7e"
+branch_labels = None
+depends_on = None
+
+LEGACY_ADMIN_STORE_FILENAME = "admin_users.json"
+
+logger = logging.getLogger("alembic.env")
+
+
+def _load_legacy_admin_ids(path):
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            payload = json.load(handle) or {}
+    except (OSError, ValueError):
+        return []
+
+    admin_ids = []
+    for value in payload.get("admins") or []:
+        try:
+            admin_ids.append(int(value))
+        except (TypeError, ValueError):
+            continue
+    return admin_ids
+
+
+def upgrade():
+    op.add_column(
+        "user",
+        sa.Column("is_admin", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.create_index(op.f("ix_user_is_admin"), "user", ["is_admin"], unique=False)
+
+    # Import admin ids from the legacy JSON store. The file is left in place
+    # (the app no longer reads it) so it can be inspected or removed by hand.
+    store_path = os.path.join(current_app.instance_path, LEGACY_ADMIN_STORE_FILENAME)
+    if not os.path.exists(store_path):
+        return
+
+    admin_ids = _load_legacy_admin_ids(store_path)
+    if admin_ids:
+        user_table = sa.table(
+            "user", sa.column("id", sa.Integer), sa.column("is_admin", sa.Boolean)
+        )
+        op.execute(
+            user_table.update()
+            .where(user_table.c.id.in_(admin_ids))
+            .values(is_admin=True)
+        )
+    logger.info(
+        "Imported %d admin id(s) from %s; the file is no longer used and can be "
+        "deleted.",
+        len(admin_ids),
+        store_path,
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_user_is_admin"), table_name="user")
+    op.drop_column("user", "is_admin")
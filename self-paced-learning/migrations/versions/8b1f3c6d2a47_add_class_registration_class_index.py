@@ -0,0 +1,31 @@
+"""add class registration class/student index
+
+Revision ID: 8b1f3c6d2a47
+Revises: 4a7d2e9c5b13
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "8b1f3c6d2a47"
+down_revision = "4a7d2e9c5b13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_class_registration_class_student",
+        "class_registration",
+        ["class_id", "student_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_class_registration_class_student", table_name="class_registration"
+    )
@@ -21,6 +21,7 @@ class User(db.Model):
     role = db.Column(Enum("student", "teacher", name="user_roles"), nullable=False)
     code = db.Column(db.String(10), nullable=True, unique=True)
     token_balance = db.Column(db.Integer, nullable=False, default=10)
+    is_admin = db.Column(db.Boolean, nullable=False, default=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     classes = db.relationship("Class", back_populates="teacher", lazy=True)
@@ -76,6 +77,7 @@ class ClassRegistration(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("student_id", "class_id", name="_student_class_uc"),
+        db.Index("ix_class_registration_class_student", "class_id", "student_id"),
     )
 
     def __repr__(self) -> str:
@@ -6,8 +6,10 @@ Extracts data access logic from the main application routes.
 
 import os
 import json
+import time
+from flask import g, has_request_context
 from utils.data_loader import DataLoader
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
 
 
 def _default_data_root() -> str:
@@ -21,6 +23,10 @@ def _default_data_root() -> str:
 class DataService:
     """Service class for handling all data operations."""
 
+    # Subjects change rarely at runtime, so discovery results are reused for
+    # this many seconds unless an admin write invalidates them first.
+    SUBJECTS_CACHE_TTL = 300
+
     def __init__(self, data_root_path: Optional[str] = None):
         """Initialize the data service with the root data path.
 
@@ -35,6 +41,8 @@ class DataService:
         resolved_path = data_root_path or _default_data_root()
         self.data_root_path = os.path.abspath(resolved_path)
         self.data_loader = DataLoader(self.data_root_path)
+        self._subjects_cache: Optional[Dict[str, Dict]] = None
+        self._subjects_cache_time = 0.0
 
     # ============================================================================
     # QUIZ DATA OPERATIONS
@@ -450,7 +458,23 @@ class DataService:
 
     def discover_subjects(self) -> Dict[str, Dict]:
         """Discover all available subjects."""
-        return self.data_loader.discover_subjects()
+        now = time.monotonic()
+        if (
+            self._subjects_cache is None
+            or now - self._subjects_cache_time > self.SUBJECTS_CACHE_TTL
+        ):
+            self._subjects_cache = self.data_loader.discover_subjects()
+            self._subjects_cache_time = now
+
+        # Callers annotate the returned entries, so hand out copies.
+        return {
+            subject_id: dict(subject_info)
+            for subject_id, subject_info in self._subjects_cache.items()
+        }
+
+    def invalidate_subjects_cache(self) -> None:
+        """Force the next discover_subjects call to rescan the filesystem."""
+        self._subjects_cache = None
 
     def load_subject_config(self, subject: str) -> Optional[Dict]:
         """Load subject configuration."""
@@ -471,6 +495,35 @@ class DataService:
         )
         return os.path.exists(videos_path)
 
+    def subtopics_with_videos(self, subject: str) -> Set[str]:
+        """Return the subtopic ids of a subject that have a videos.json file.
+
+        The subject directory is listed once and the result is memoized for
+        the current request. Outside a request nothing is memoized, so callers
+        checking one subtopic should use ``videos_file_exists`` instead.
+        """
+        cache_key = (self.data_root_path, subject)
+        if has_request_context():
+            request_cache = g.setdefault("_subtopics_with_videos", {})
+            if cache_key in request_cache:
+                return request_cache[cache_key]
+
+        subject_dir = os.path.join(self.data_root_path, "subjects", subject)
+        subtopics: Set[str] = set()
+        try:
+            with os.scandir(subject_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir() and os.path.exists(
+                        os.path.join(entry.path, "videos.json")
+                    ):
+                        subtopics.add(entry.name)
+        except OSError:
+            pass
+
+        if has_request_context():
+            request_cache[cache_key] = subtopics
+        return subtopics
+
     def create_subject(self, subject_id: str, subject_data: Dict) -> bool:
         """Create a new subject with its directory structure and files."""
         try:
@@ -903,14 +956,17 @@ class DataService:
     def clear_cache(self) -> None:
         """Clear all cached data."""
         self.data_loader.clear_cache()
+        self.invalidate_subjects_cache()
         self._clear_flask_cache()
 
     def clear_cache_for_subject_subtopic(self, subject: str, subtopic: str) -> None:
         """Clear cache for specific subject/subtopic."""
         self.data_loader.clear_cache_for_subject_subtopic(subject, subtopic)
+        self.invalidate_subjects_cache()
         self._clear_flask_cache()
 
     def clear_cache_for_subject(self, subject: str) -> None:
         """Clear all cached data for a subject."""
         self.data_loader.clear_cache_for_subject(subject)
+        self.invalidate_subjects_cache()
         self._clear_flask_cache()
@@ -4,15 +4,47 @@ Handles all learning progress tracking, session management, and user state.
 Extracts progress logic from the main application routes.
 """
 
-from collections import defaultdict
 from datetime import datetime, timedelta
-from flask import session, has_request_context, current_app
-from typing import Dict, List, Optional, Any, Tuple
+from functools import lru_cache
+from itertools import chain, groupby
+from operator import itemgetter
+from flask import session, has_app_context, has_request_context, current_app, g
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+
+# Lesson "type" values accepted by each lesson filter. No filter accepts every
+# lesson; unspecified or "all" lessons count as initial-friendly. Any other
+# filter value only matches lessons of exactly that type.
+_LESSON_TYPE_ACCEPTS: Dict[str, Optional[FrozenSet[str]]] = {
+    "": None,
+    "initial": frozenset({"", "initial", "all"}),
+    "remedial": frozenset({"remedial", "all"}),
+}
+
+
+@lru_cache(maxsize=4096)
+def _session_key(subject: str, subtopic: str, key_type: str) -> str:
+    """Build (and memoize) a prefixed session key."""
+    return f"{subject}_{subtopic}_{key_type}"
 
 
 class ProgressService:
     """Service class for handling learning progress and session management."""
 
+    # Session key holding [subject, subtopic] pairs that have progress so that
+    # ``get_all_progress`` does not need to scan (or re-parse) session keys.
+    PROGRESS_SUBTOPIC_INDEX = "_progress_subtopics"
+    PROGRESS_DATA_TYPES = ("completed_lessons", "watched_videos")
+
     def __init__(self):
         """Initialize the progress service."""
         self._test_completed_lessons = {}
@@ -21,10 +53,26 @@ class ProgressService:
         self._server_state_store: Dict[str, Dict[str, Dict[str, Any]]] = {}
         self._test_server_state_store: Dict[str, Dict[str, Dict[str, Any]]] = {}
 
+    def init_app(self, app) -> None:
+        """Register request hooks used by the progress service."""
+        app.after_request(self._persist_session_permanence)
+
     # ============================================================================
     # SESSION KEY MANAGEMENT
     # ============================================================================
 
+    def _mark_progress_modified(self) -> None:
+        """Flag the session to be made permanent once the request completes."""
+        if has_request_context():
+            g._progress_modified = True
+
+    @staticmethod
+    def _persist_session_permanence(response):
+        """Make the session permanent once per request after progress writes."""
+        if g.pop("_progress_modified", False):
+            session.permanent = True
+        return response
+
     def generate_session_key(self) -> str:
         """Generate a secure, random session key."""
 
@@ -49,7 +97,7 @@ class ProgressService:
         if not server_id:
             server_id = self.generate_session_key()
             session["_server_state_id"] = server_id
-            session.permanent = True
+            self._mark_progress_modified()
         return server_id
 
     def _get_user_state(
@@ -136,7 +184,43 @@ class ProgressService:
 
     def get_session_key(self, subject: str, subtopic: str, key_type: str) -> str:
         """Generate a prefixed session key for a specific subject/subtopic."""
-        return f"{subject}_{subtopic}_{key_type}"
+        return _session_key(subject, subtopic, key_type)
+
+    def _index_progress_subtopic(self, subject: str, subtopic: str) -> None:
+        """Record a subject/subtopic with progress in the progress index."""
+        pair = [subject, subtopic]
+        index = session.get(self.PROGRESS_SUBTOPIC_INDEX)
+        if index is None:
+            # Seed from existing keys so progress saved before the index
+            # existed stays visible once the index takes over. The scan may
+            # mis-split this pair's own keys, so its entry is replaced.
+            key_prefix = f"{subject}_{subtopic}"
+            index = [
+                scanned
+                for scanned in self._scan_progress_subtopics()
+                if f"{scanned[0]}_{scanned[1]}" != key_prefix
+            ]
+        elif pair in index:
+            return
+        session[self.PROGRESS_SUBTOPIC_INDEX] = index + [pair]
+
+    def _scan_progress_subtopics(self) -> List[List[str]]:
+        """Recover [subject, subtopic] pairs from progress keys in the session.
+
+        Only needed for sessions written before the index existed. Key names
+        cannot tell an underscore in the subject from the separator, so the
+        subject is taken to end at the first underscore.
+        """
+        pairs: List[List[str]] = []
+        for key in session.keys():
+            for data_type in self.PROGRESS_DATA_TYPES:
+                suffix = f"_{data_type}"
+                if key.endswith(suffix):
+                    subject, _, subtopic = key[: -len(suffix)].partition("_")
+                    if subject and subtopic and [subject, subtopic] not in pairs:
+                        pairs.append([subject, subtopic])
+                    break
+        return pairs
 
     def clear_session_data(self, subject: str, subtopic: str) -> None:
         """Clear all session data for a specific subject/subtopic."""
@@ -153,6 +237,7 @@ class ProgressService:
         watched_key = self.get_session_key(subject, subtopic, "watched_videos")
         self._test_watched_videos.pop(watched_key, None)
         self._clear_user_state_for_subject(subject, subtopic)
+        self._invalidate_content_status_cache()
 
     def reset_quiz_context(self) -> None:
         """Clear cross-subject quiz context stored in the session."""
@@ -182,6 +267,9 @@ class ProgressService:
         else:
             session_id = "_test_session"
         session.clear()
+        if has_request_context():
+            g.pop("_admin_override_status", None)
+            g.pop("_content_status_cache", None)
         self._test_completed_lessons.clear()
         self._test_watched_videos.clear()
         self._test_admin_override = False
@@ -280,7 +368,9 @@ class ProgressService:
             if lesson_id not in completed_lessons:
                 completed_lessons.append(lesson_id)
                 session[completed_key] = completed_lessons
-                session.permanent = True
+                self._index_progress_subtopic(subject, subtopic)
+                self._invalidate_content_status_cache()
+                self._mark_progress_modified()
 
             self._persist_completion(subject, subtopic, lesson_id, "lesson", True)
             return True
@@ -319,7 +409,7 @@ class ProgressService:
             normalized = [str(lesson_id) for lesson_id in completed_lessons]
             if normalized != completed_lessons:
                 session[completed_key] = normalized
-                session.permanent = True
+                self._mark_progress_modified()
             return normalized
 
         user_id = session.get("user_id")
@@ -365,7 +455,8 @@ class ProgressService:
 
         completed_lessons = [str(row.item_id) for row in records]
         session[completed_key] = completed_lessons
-        session.permanent = True
+        self._index_progress_subtopic(subject, subtopic)
+        self._mark_progress_modified()
         return completed_lessons
 
     def get_lesson_progress_stats(
@@ -423,7 +514,8 @@ class ProgressService:
                         for lesson_id in completed_lessons
                     ]
                     session[completed_key] = completed_lessons
-                    session.permanent = True
+                    self._invalidate_content_status_cache()
+                    self._mark_progress_modified()
                     updated_count = 1
 
             return {
@@ -458,7 +550,9 @@ class ProgressService:
             if video_id not in watched_videos:
                 watched_videos.append(video_id)
                 session[watched_key] = watched_videos
-                session.permanent = True
+                self._index_progress_subtopic(subject, subtopic)
+                self._invalidate_content_status_cache()
+                self._mark_progress_modified()
 
             self._persist_completion(subject, subtopic, video_id, "video", True)
             return True
@@ -594,7 +688,7 @@ class ProgressService:
         key = self.get_session_key(subject, subtopic, "analysis_results")
         self._set_user_state_value("quiz_analysis", key, sanitized)
         session[key] = sanitized
-        session.permanent = True
+        self._mark_progress_modified()
         return sanitized
 
     def get_quiz_analysis(
@@ -618,7 +712,7 @@ class ProgressService:
         key = self.get_session_key(subject, subtopic, "quiz_answers")
         self._set_user_state_value("quiz_answers", key, sanitized_answers)
         session[key] = sanitized_answers
-        session.permanent = True
+        self._mark_progress_modified()
         return sanitized_answers
 
     def get_quiz_answers(self, subject: str, subtopic: str) -> List[str]:
@@ -650,7 +744,7 @@ class ProgressService:
         key = self.get_session_key(subject, subtopic, "wrong_indices")
         self._set_user_state_value("quiz_analysis", key, sanitized)
         session[key] = sanitized
-        session.permanent = True
+        self._mark_progress_modified()
         return sanitized
 
     def get_wrong_indices(self, subject: str, subtopic: str) -> List[int]:
@@ -681,7 +775,7 @@ class ProgressService:
             normalized.append(cleaned)
         weak_key = self.get_session_key(subject, subtopic, "weak_topics")
         session[weak_key] = normalized
-        session.permanent = True
+        self._mark_progress_modified()
 
     def get_weak_topics(self, subject: str, subtopic: str) -> List[str]:
         """Return stored weak topics, if any."""
@@ -843,23 +937,19 @@ class ProgressService:
         """Get all progress data from the current session."""
         progress_data = {}
 
-        # Extract all progress-related session keys
-        for key, value in session.items():
-            if "_completed_lessons" in key or "_watched_videos" in key:
-                # Parse subject and subtopic from key
-                parts = key.split("_")
-                if len(parts) >= 3:
-                    subject = parts[0]
-                    subtopic = parts[1]
-                    data_type = "_".join(parts[2:])
-
-                    if subject not in progress_data:
-                        progress_data[subject] = {}
+        subtopic_pairs = session.get(self.PROGRESS_SUBTOPIC_INDEX)
+        if subtopic_pairs is None:
+            # Sessions created before the index existed need a one-off scan.
+            subtopic_pairs = self._scan_progress_subtopics()
 
-                    if subtopic not in progress_data[subject]:
-                        progress_data[subject][subtopic] = {}
-
-                    progress_data[subject][subtopic][data_type] = value
+        for subject, subtopic in subtopic_pairs:
+            for data_type in self.PROGRESS_DATA_TYPES:
+                value = session.get(self.get_session_key(subject, subtopic, data_type))
+                if value is None:
+                    continue
+                progress_data.setdefault(subject, {}).setdefault(subtopic, {})[
+                    data_type
+                ] = value
 
         return progress_data
 
@@ -874,13 +964,15 @@ class ProgressService:
                 return self.mark_video_complete(subject, subtopic, item_id)
             else:
                 return False
-        except Exception as e:
-            print(f"Error updating progress: {e}")
+        except Exception:
+            if has_app_context():
+                current_app.logger.exception("Error updating progress")
             return False
 
-    def get_student_progress_summary(self, student_id: int) -> Dict[str, Any]:
-        """Return aggregated lesson progress for the specified student."""
-        summary: Dict[str, Any] = {
+    @staticmethod
+    def _empty_progress_summary() -> Dict[str, Any]:
+        """Return a progress summary with no subjects."""
+        return {
             "completed_lessons": 0,
             "total_lessons": 0,
             "subject_count": 0,
@@ -888,8 +980,32 @@ class ProgressService:
             "subjects": [],
         }
 
+    def get_student_progress_summary(self, student_id: int) -> Dict[str, Any]:
+        """Return aggregated lesson progress for the specified student."""
         if not student_id:
-            return summary
+            return self._empty_progress_summary()
+
+        summaries = self.get_students_progress_summary([student_id])
+        return summaries.get(student_id) or self._empty_progress_summary()
+
+    def get_students_progress_summary(
+        self, student_ids: List[int]
+    ) -> Dict[int, Dict[str, Any]]:
+        """Return aggregated lesson progress for several students.
+
+        Progress rows for all students are fetched with a single query, and
+        subject configs and lesson plans are loaded once and shared across
+        the students' summaries.
+        """
+        unique_ids = [
+            student_id for student_id in dict.fromkeys(student_ids or []) if student_id
+        ]
+        summaries: Dict[int, Dict[str, Any]] = {
+            student_id: self._empty_progress_summary() for student_id in unique_ids
+        }
+
+        if not unique_ids:
+            return summaries
 
         logger = None
         try:
@@ -898,6 +1014,9 @@ class ProgressService:
             logger = None
 
         try:
+            from sqlalchemy import select
+
+            from extensions import db
             from models import LessonProgress
             from services import get_data_service
         except Exception as import_exc:  # pragma: no cover - defensive
@@ -905,7 +1024,7 @@ class ProgressService:
                 logger.debug(
                     "Progress summary unavailable due to import error: %s", import_exc
                 )
-            return summary
+            return summaries
 
         data_service = get_data_service()
 
@@ -916,32 +1035,48 @@ class ProgressService:
             if logger:
                 logger.warning("Unable to discover subjects for summary: %s", exc)
 
-        lesson_records = (
-            LessonProgress.query.filter_by(student_id=student_id, item_type="lesson")
-            .order_by(LessonProgress.subject.asc(), LessonProgress.subtopic.asc())
-            .all()
-        )
-
-        progress_by_subtopic: Dict[Tuple[str, str], Dict[str, bool]] = defaultdict(dict)
-        for record in lesson_records:
-            key = (record.subject, record.subtopic)
-            progress_by_subtopic[key][str(record.item_id)] = bool(record.completed)
-
-        subject_order: List[str] = list(subjects_meta.keys())
-        for subject_id, _ in progress_by_subtopic.keys():
-            if subject_id not in subject_order:
-                subject_order.append(subject_id)
+        # A Core select keeps this read-only aggregation out of the ORM
+        # identity map; rows come back as plain column tuples.
+        lesson_records = db.session.execute(
+            select(
+                LessonProgress.student_id,
+                LessonProgress.subject,
+                LessonProgress.subtopic,
+                LessonProgress.item_id,
+                LessonProgress.completed,
+            )
+            .where(
+                LessonProgress.student_id.in_(unique_ids),
+                LessonProgress.item_type == "lesson",
+            )
+            .order_by(
+                LessonProgress.student_id.asc(),
+                LessonProgress.subject.asc(),
+                LessonProgress.subtopic.asc(),
+            )
+        ).all()
+
+        # Rows arrive sorted by student/subject/subtopic, so each subtopic's
+        # records are normally one group. Groups are merged rather than
+        # assigned in case the database collation splits a run.
+        # ``item_id`` and ``completed`` are non-null String/Boolean columns, so
+        # the projected values are used as-is.
+        progress_by_student: Dict[int, Dict[str, Dict[str, Dict[str, bool]]]] = {}
+        for (student_id, subject, subtopic), records in groupby(
+            lesson_records, key=itemgetter(0, 1, 2)
+        ):
+            progress_by_student.setdefault(student_id, {}).setdefault(
+                subject, {}
+            ).setdefault(subtopic, {}).update(
+                (item_id, completed) for _, _, _, item_id, completed in records
+            )
 
-        summary_subjects: List[Dict[str, Any]] = []
-        total_lessons = 0
-        total_completed = 0
-        total_subtopics = 0
+        subtopics_config_cache: Dict[str, Dict[str, Any]] = {}
+        lessons_cache: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
 
-        for subject_id in subject_order:
-            subject_meta = subjects_meta.get(subject_id, {})
-            subject_display = subject_meta.get(
-                "name", subject_id.replace("_", " ").title()
-            )
+        def get_subtopics_config(subject_id: str) -> Dict[str, Any]:
+            if subject_id in subtopics_config_cache:
+                return subtopics_config_cache[subject_id]
 
             try:
                 subject_config = data_service.load_subject_config(subject_id) or {}
@@ -956,43 +1091,88 @@ class ProgressService:
             if isinstance(subject_config, dict):
                 subtopics_config = subject_config.get("subtopics", {}) or {}
 
-            subtopics_in_config = list(subtopics_config.keys())
-            subtopics_in_progress = [
+            subtopics_config_cache[subject_id] = subtopics_config
+            return subtopics_config
+
+        def get_lessons(subject_id: str, subtopic_id: str) -> List[Dict[str, Any]]:
+            key = (subject_id, subtopic_id)
+            if key in lessons_cache:
+                return lessons_cache[key]
+
+            try:
+                lessons = data_service.get_lesson_plans(
+                    subject_id, subtopic_id, include_unlisted=False
+                ) or []
+            except Exception as exc:
+                lessons = []
+                if logger:
+                    logger.debug(
+                        "Failed to load lessons for %s/%s: %s",
+                        subject_id,
+                        subtopic_id,
+                        exc,
+                    )
+
+            lessons_cache[key] = lessons
+            return lessons
+
+        for student_id in unique_ids:
+            summaries[student_id] = self._build_progress_summary(
+                progress_by_student.get(student_id, {}),
+                subjects_meta,
+                get_subtopics_config,
+                get_lessons,
+            )
+
+        return summaries
+
+    def _build_progress_summary(
+        self,
+        progress_by_subtopic: Dict[str, Dict[str, Dict[str, bool]]],
+        subjects_meta: Dict[str, Dict[str, Any]],
+        get_subtopics_config: Callable[[str], Dict[str, Any]],
+        get_lessons: Callable[[str, str], List[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """Assemble one student's summary from their grouped progress rows."""
+        summary = self._empty_progress_summary()
+
+        # Configured subjects first, then any subjects only seen in progress
+        subject_order: List[str] = list(
+            dict.fromkeys(chain(subjects_meta, progress_by_subtopic))
+        )
+
+        summary_subjects: List[Dict[str, Any]] = []
+        total_lessons = 0
+        total_completed = 0
+        total_subtopics = 0
+
+        for subject_id in subject_order:
+            subject_meta = subjects_meta.get(subject_id, {})
+            subject_display = subject_meta.get(
+                "name", subject_id.replace("_", " ").title()
+            )
+
+            subtopics_config = get_subtopics_config(subject_id)
+
+            subject_progress = progress_by_subtopic.get(subject_id, {})
+            subtopic_ids: List[str] = [
                 subtopic
-                for (subject, subtopic) in progress_by_subtopic.keys()
-                if subject == subject_id
+                for subtopic in dict.fromkeys(chain(subtopics_config, subject_progress))
+                if subtopic
             ]
 
-            seen_subtopics = set()
-            subtopic_ids: List[str] = []
-            for subtopic in subtopics_in_config + subtopics_in_progress:
-                if subtopic and subtopic not in seen_subtopics:
-                    seen_subtopics.add(subtopic)
-                    subtopic_ids.append(subtopic)
-
             subject_subtopics: List[Dict[str, Any]] = []
             subject_total_lessons = 0
             subject_completed_lessons = 0
 
             for subtopic_id in subtopic_ids:
-                try:
-                    lessons = data_service.get_lesson_plans(
-                        subject_id, subtopic_id, include_unlisted=False
-                    ) or []
-                except Exception as exc:
-                    lessons = []
-                    if logger:
-                        logger.debug(
-                            "Failed to load lessons for %s/%s: %s",
-                            subject_id,
-                            subtopic_id,
-                            exc,
-                        )
-
-                if not lessons and (subject_id, subtopic_id) in progress_by_subtopic:
+                lessons = get_lessons(subject_id, subtopic_id)
+
+                subtopic_progress = subject_progress.get(subtopic_id, {})
+                if not lessons and subtopic_progress:
                     lessons = [
                         {"id": lesson_id, "title": lesson_id.replace("_", " ").title()}
-                        for lesson_id in progress_by_subtopic[(subject_id, subtopic_id)]
+                        for lesson_id in subtopic_progress
                     ]
 
                 lesson_entries: List[Dict[str, Any]] = []
@@ -1003,9 +1183,7 @@ class ProgressService:
                     if not lesson_id:
                         continue
 
-                    completed = progress_by_subtopic.get(
-                        (subject_id, subtopic_id), {}
-                    ).get(lesson_id, False)
+                    completed = subtopic_progress.get(lesson_id, False)
                     if completed:
                         completed_count += 1
 
@@ -1112,7 +1290,8 @@ class ProgressService:
 
         status = bool(enabled)
         session["admin_override"] = status
-        session.permanent = True
+        self._mark_progress_modified()
+        g._admin_override_status = (session._get_current_object(), status)
         return status
 
     def toggle_admin_override(self) -> bool:
@@ -1124,7 +1303,26 @@ class ProgressService:
         """Get current admin override status."""
         if not has_request_context():
             return bool(self._test_admin_override)
-        return session.get("admin_override", False)
+
+        # Cache per request; the session identity check keeps the value fresh
+        # when an app context outlives a single request (e.g. in tests).
+        current_session = session._get_current_object()
+        cached = g.get("_admin_override_status")
+        if cached is not None and cached[0] is current_session:
+            return cached[1]
+
+        status = bool(current_session.get("admin_override", False))
+        g._admin_override_status = (current_session, status)
+        return status
+
+    @staticmethod
+    def _iter_content_ids(raw_items: Any, prefix: str) -> Iterator[str]:
+        """Yield item ids from a dict- or list-shaped lessons/videos payload."""
+        if isinstance(raw_items, dict):
+            yield from raw_items.keys()
+        elif isinstance(raw_items, list):
+            for index, item in enumerate(raw_items):
+                yield item.get("id") or f"{prefix}_{index + 1}"
 
     def admin_mark_complete(self, subject: str, subtopic: str) -> bool:
         """Mark a topic as complete for admin override functionality."""
@@ -1133,49 +1331,45 @@ class ProgressService:
 
             data_service = get_data_service()
             loader = data_service.data_loader
+            key_prefix = f"{subject}_{subtopic}_"
 
             # Mark all lessons as completed
             lessons_payload = loader.load_lesson_plans(subject, subtopic) or {}
-            raw_lessons = lessons_payload.get("lessons", [])
-            lesson_ids: List[str] = []
-
-            if isinstance(raw_lessons, dict):
-                lesson_ids = list(raw_lessons.keys())
-            elif isinstance(raw_lessons, list):
-                for index, lesson in enumerate(raw_lessons):
-                    lesson_id = lesson.get("id") or f"lesson_{index + 1}"
-                    lesson_ids.append(lesson_id)
+            # Use a unique ordered list to avoid duplicate entries
+            lesson_ids = list(
+                dict.fromkeys(
+                    self._iter_content_ids(lessons_payload.get("lessons", []), "lesson")
+                )
+            )
 
             if lesson_ids:
-                completed_key = self.get_session_key(
-                    subject, subtopic, "completed_lessons"
-                )
-                # Use a unique ordered list to avoid duplicate entries
-                session[completed_key] = list(dict.fromkeys(lesson_ids))
+                completed_key = key_prefix + "completed_lessons"
+                session[completed_key] = lesson_ids
+                self._index_progress_subtopic(subject, subtopic)
 
             # Mark all videos as watched
             videos_payload = loader.load_videos(subject, subtopic) or {}
-            raw_videos = videos_payload.get("videos", [])
-            video_ids: List[str] = []
-
-            if isinstance(raw_videos, dict):
-                video_ids = list(raw_videos.keys())
-            elif isinstance(raw_videos, list):
-                for index, video in enumerate(raw_videos):
-                    video_id = video.get("id") or f"video_{index + 1}"
-                    video_ids.append(video_id)
+            video_ids = list(
+                dict.fromkeys(
+                    self._iter_content_ids(videos_payload.get("videos", []), "video")
+                )
+            )
 
             if video_ids:
-                watched_key = self.get_session_key(subject, subtopic, "watched_videos")
-                session[watched_key] = list(dict.fromkeys(video_ids))
+                watched_key = key_prefix + "watched_videos"
+                session[watched_key] = video_ids
+                self._index_progress_subtopic(subject, subtopic)
 
             # Flag the subtopic as completed via admin override
-            override_key = self.get_session_key(subject, subtopic, "admin_complete")
-            session[override_key] = True
-            session.permanent = True
+            session[key_prefix + "admin_complete"] = True
+            self._invalidate_content_status_cache()
+            self._mark_progress_modified()
             return True
-        except Exception as e:
-            print(f"Error in admin mark complete: {e}")
+        except Exception:
+            if has_app_context():
+                current_app.logger.exception(
+                    "Error in admin mark complete for %s/%s", subject, subtopic
+                )
             return False
 
     def is_admin_complete(self, subject: str, subtopic: str) -> bool:
@@ -1187,14 +1381,56 @@ class ProgressService:
     # PREREQUISITE CHECKING
     # ============================================================================
 
+    def _invalidate_content_status_cache(self) -> None:
+        """Drop memoized content status after progress changes in this request."""
+        if has_request_context():
+            g.pop("_content_status_cache", None)
+
     def _collect_subtopic_content_status(
         self,
         subject: str,
         subtopic: str,
         lesson_type: Optional[str] = None,
+        include_missing: bool = True,
     ) -> Dict[str, Any]:
         """Gather lesson/video completion state for a subtopic.
 
+        Results are memoized for the current request so a subtopic that is a
+        prerequisite of several targets is only evaluated once per render.
+        Outside a request context the status is always recomputed.
+        """
+        if not has_request_context():
+            return self._compute_subtopic_content_status(
+                subject, subtopic, lesson_type, include_missing
+            )
+
+        current_session = session._get_current_object()
+        cached = g.get("_content_status_cache")
+        if cached is None or cached[0] is not current_session:
+            cached = (current_session, {})
+            g._content_status_cache = cached
+
+        base_key = (subject, subtopic, lesson_type or "")
+        # A full status also answers a counts-only request.
+        status = cached[1].get(base_key + (True,))
+        if status is None and not include_missing:
+            status = cached[1].get(base_key + (False,))
+        if status is None:
+            status = self._compute_subtopic_content_status(
+                subject, subtopic, lesson_type, include_missing
+            )
+            cached[1][base_key + (include_missing,)] = status
+        return status
+
+    def _compute_subtopic_content_status(
+        self,
+        subject: str,
+        subtopic: str,
+        lesson_type: Optional[str] = None,
+        include_missing: bool = True,
+    ) -> Dict[str, Any]:
+        """Build lesson/video completion state for a subtopic.
+
         Args:
             subject: The subject slug.
             subtopic: The subtopic slug.
@@ -1202,6 +1438,8 @@ class ProgressService:
                 or None for all lessons). When provided the returned lesson
                 statistics will only include lessons matching the requested
                 type ("all" lessons are always included).
+            include_missing: When False only completion flags and counts are
+                computed; the ``missing_*`` lists are returned empty.
 
         Returns:
             A dictionary describing lesson/video completion state constrained
@@ -1215,23 +1453,24 @@ class ProgressService:
             subject, subtopic, include_unlisted=False
         ) or []
 
-        lesson_items: List[Tuple[str, Dict[str, Any]]] = []
         normalized_lesson_type = (lesson_type or "").strip().lower()
+        accepted_types = _LESSON_TYPE_ACCEPTS.get(
+            normalized_lesson_type, frozenset({normalized_lesson_type})
+        )
 
         def include_lesson(entry: Dict[str, Any]) -> bool:
-            if not normalized_lesson_type:
+            if accepted_types is None:
                 return True
 
             raw_value = entry.get("type")
             raw_type = "" if raw_value is None else str(raw_value).strip().lower()
+            return raw_type in accepted_types
 
-            if normalized_lesson_type == "initial":
-                # Treat unspecified or "all" lessons as initial friendly
-                return raw_type in {"", "initial", "all"}
-            if normalized_lesson_type == "remedial":
-                return raw_type in {"remedial", "all"}
-
-            return raw_type == normalized_lesson_type
+        completed_lessons = set(self.get_completed_lessons(subject, subtopic))
+        lesson_ids: List[str] = []
+        seen_lesson_ids = set()
+        missing_lessons: List[str] = []
+        missing_lesson_count = 0
 
         for index, lesson in enumerate(lessons):
             lesson = lesson or {}
@@ -1243,54 +1482,57 @@ class ProgressService:
                 or f"lesson_{index + 1}"
             )
             lesson_id = str(lesson_id) if lesson_id is not None else ""
-            if not lesson_id:
+            if not lesson_id or lesson_id in seen_lesson_ids:
                 continue
-            lesson_items.append((lesson_id, lesson))
-
-        lesson_titles = {
-            lesson_id: lesson.get("title", lesson_id)
-            for lesson_id, lesson in lesson_items
-        }
-        lesson_ids = list(lesson_titles.keys())
+            seen_lesson_ids.add(lesson_id)
+            lesson_ids.append(lesson_id)
+            if lesson_id not in completed_lessons:
+                missing_lesson_count += 1
+                if include_missing:
+                    missing_lessons.append(lesson.get("title", lesson_id))
 
-        completed_lessons = set(self.get_completed_lessons(subject, subtopic))
-        missing_lessons = [
-            lesson_titles[lesson_id]
-            for lesson_id in lesson_ids
-            if lesson_id not in completed_lessons
-        ]
+        # The directory listing only pays off when memoized for a request;
+        # otherwise a single stat is cheaper.
+        if has_request_context():
+            has_videos = subtopic in data_service.subtopics_with_videos(subject)
+        else:
+            has_videos = data_service.videos_file_exists(subject, subtopic)
 
         raw_videos: List[Any] = []
-        if data_service.videos_file_exists(subject, subtopic):
+        if has_videos:
             videos_data = data_service.get_video_data(subject, subtopic) or {}
             raw_videos = videos_data.get("videos", []) or []
 
-        video_titles: Dict[str, str] = {}
+        watched_videos = set(self.get_watched_videos(subject, subtopic))
         video_ids: List[str] = []
+        missing_videos: List[str] = []
+        missing_video_count = 0
         for index, video in enumerate(raw_videos):
             if isinstance(video, dict):
                 video_id = video.get("id") or f"video_{index + 1}"
-                video_title = video.get("title", video_id)
             else:
                 video_id = f"video_{index + 1}"
-                video_title = video_id
             video_ids.append(video_id)
-            video_titles[video_id] = video_title
-
-        watched_videos = set(self.get_watched_videos(subject, subtopic))
-        missing_videos = [
-            video_titles.get(video_id, video_id)
-            for video_id in video_ids
-            if video_id not in watched_videos
-        ]
+            if video_id not in watched_videos:
+                missing_video_count += 1
+                if include_missing:
+                    video_title = (
+                        video.get("title", video_id)
+                        if isinstance(video, dict)
+                        else video_id
+                    )
+                    missing_videos.append(video_title)
 
-        lessons_complete = len(missing_lessons) == 0 if lesson_ids else True
-        videos_complete = len(missing_videos) == 0 if video_ids else True
+        lessons_complete = missing_lesson_count == 0
+        videos_complete = missing_video_count == 0
         all_content_complete = lessons_complete and videos_complete
 
         missing_items: List[str] = []
-        missing_items.extend([f"Complete lesson: {title}" for title in missing_lessons])
-        missing_items.extend([f"Watch video: {title}" for title in missing_videos])
+        if include_missing:
+            missing_items.extend(
+                [f"Complete lesson: {title}" for title in missing_lessons]
+            )
+            missing_items.extend([f"Watch video: {title}" for title in missing_videos])
 
         return {
             "lesson_ids": lesson_ids,
@@ -1300,8 +1542,8 @@ class ProgressService:
             "lessons_complete": lessons_complete,
             "videos_complete": videos_complete,
             "missing_items": missing_items,
-            "lessons_completed": len(lesson_ids) - len(missing_lessons),
-            "videos_watched": len(video_ids) - len(missing_videos),
+            "lessons_completed": len(lesson_ids) - missing_lesson_count,
+            "videos_watched": len(video_ids) - missing_video_count,
             "total_lessons": len(lesson_ids),
             "total_videos": len(video_ids),
             "all_content_complete": all_content_complete,
@@ -1407,8 +1649,26 @@ class ProgressService:
                 missing_names.append(display_name)
                 continue
 
+            if admin_override:
+                # The override satisfies every prerequisite, so skip loading
+                # each prerequisite's lesson and video content.
+                prerequisite_details.append(
+                    {
+                        "id": prereq_id,
+                        "name": display_name,
+                        "is_complete": True,
+                        "reason": "admin_override",
+                        "lesson_total": 0,
+                        "lessons_completed": 0,
+                        "video_total": 0,
+                        "videos_watched": 0,
+                    }
+                )
+                continue
+
+            # Only completion flags and counts are reported per prerequisite.
             progress = self._collect_subtopic_content_status(
-                subject, prereq_id, lesson_type="initial"
+                subject, prereq_id, lesson_type="initial", include_missing=False
             )
             is_complete = progress["all_content_complete"]
 
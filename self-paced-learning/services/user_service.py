@@ -2,75 +2,86 @@
 
 import json
 import os
-import math
-import random
+import secrets
 import string
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 from flask import current_app
+from sqlalchemy import or_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from extensions import db
 from models import Class, ClassRegistration, User
 
+# Dialect-specific INSERT constructs that support ON CONFLICT DO NOTHING.
+_UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+
+@lru_cache(maxsize=None)
+def _default_account_password_hash(password: str) -> str:
+    """Hash a built-in demo account password once per process."""
+    return generate_password_hash(password)
+
 
 class UserService:
     """Encapsulates authentication and teacher/class management logic."""
 
     CODE_LENGTH = 6
-    ADMIN_STORE_FILENAME = "admin_users.json"
+    CODE_CANDIDATE_BATCH = 8
+    _CODE_ALPHABET = string.ascii_uppercase + string.digits
     TEACHER_TOPIC_ASSIGNMENTS_FILENAME = "teacher_topic_assignments.json"
     TOKEN_CHARS_PER = 250
 
+    # Built-in demo accounts, created on first login with these credentials.
+    DEFAULT_ADMIN_USERNAME = "admin"
+    DEFAULT_ADMIN_EMAIL = "admin@example.com"
+    DEFAULT_ADMIN_PASSWORD = "admin123"
+    DEFAULT_STUDENT_USERNAME = "student"
+    DEFAULT_STUDENT_EMAIL = "student@example.com"
+    DEFAULT_STUDENT_PASSWORD = "student123"
+    _ADMIN_IDENTIFIERS = frozenset({DEFAULT_ADMIN_USERNAME, DEFAULT_ADMIN_EMAIL})
+    _STUDENT_IDENTIFIERS = frozenset(
+        {DEFAULT_STUDENT_USERNAME, DEFAULT_STUDENT_EMAIL}
+    )
+
+    def __init__(self):
+        """Initialize per-instance caches."""
+        # Resolved assignment store path per instance directory, so the
+        # directory is only created once rather than on every store access.
+        self._assignment_store_paths: Dict[str, str] = {}
+
     def _generate_class_code(self) -> str:
         """Generate a random alphanumeric class code."""
-        alphabet = string.ascii_uppercase + string.digits
-        return "".join(random.choices(alphabet, k=self.CODE_LENGTH))
+        return "".join(
+            secrets.choice(self._CODE_ALPHABET) for _ in range(self.CODE_LENGTH)
+        )
 
     def _generate_unique_teacher_code(self) -> str:
-        """Generate a unique teacher code."""
-        while True:
-            candidate = self._generate_class_code()
-            if not User.query.filter_by(code=candidate).first():
-                return candidate
-
-    def _get_admin_store_path(self) -> str:
-        """Return the path to the admin user store."""
-        if current_app:
-            base_dir = current_app.instance_path
-        else:
-            base_dir = os.path.join(os.getcwd(), "instance")
-        os.makedirs(base_dir, exist_ok=True)
-        return os.path.join(base_dir, self.ADMIN_STORE_FILENAME)
-
-    def _load_admin_store(self) -> Dict[str, List[int]]:
-        """Load admin user IDs from disk."""
-        path = self._get_admin_store_path()
-        if not os.path.exists(path):
-            return {"admins": []}
+        """Generate a unique teacher code.
 
-        try:
-            with open(path, "r", encoding="utf-8") as handle:
-                payload = json.load(handle) or {}
-        except Exception as exc:
-            if current_app:
-                current_app.logger.exception(
-                    "Failed to read admin user store: %s", exc
-                )
-            return {"admins": []}
-
-        admins = payload.get("admins")
-        if not isinstance(admins, list):
-            admins = []
-        return {"admins": admins}
-
-    def _save_admin_store(self, admin_ids: List[int]) -> None:
-        """Persist admin user IDs to disk."""
-        path = self._get_admin_store_path()
-        unique_ids = sorted({int(value) for value in admin_ids if value})
-        payload = {"admins": unique_ids}
-        with open(path, "w", encoding="utf-8") as handle:
-            json.dump(payload, handle, indent=2)
+        Candidates are checked against existing codes in batches so a single
+        query almost always suffices.
+        """
+        batch_size = self.CODE_CANDIDATE_BATCH
+        while True:
+            candidates = {self._generate_class_code() for _ in range(batch_size)}
+            taken = {
+                code
+                for (code,) in db.session.query(User.code)
+                .filter(User.code.in_(candidates))
+                .all()
+            }
+            available = candidates - taken
+            if available:
+                return next(iter(available))
+            batch_size *= 2
 
     def _get_teacher_topic_assignment_store_path(self) -> str:
         """Return the path to the teacher topic assignment store."""
@@ -78,8 +89,13 @@ class UserService:
             base_dir = current_app.instance_path
         else:
             base_dir = os.path.join(os.getcwd(), "instance")
-        os.makedirs(base_dir, exist_ok=True)
-        return os.path.join(base_dir, self.TEACHER_TOPIC_ASSIGNMENTS_FILENAME)
+
+        path = self._assignment_store_paths.get(base_dir)
+        if path is None:
+            os.makedirs(base_dir, exist_ok=True)
+            path = os.path.join(base_dir, self.TEACHER_TOPIC_ASSIGNMENTS_FILENAME)
+            self._assignment_store_paths[base_dir] = path
+        return path
 
     def _load_teacher_topic_assignment_store(self) -> Dict[str, List[Dict[str, str]]]:
         """Load teacher subject assignments from disk."""
@@ -167,55 +183,62 @@ class UserService:
         with open(path, "w", encoding="utf-8") as handle:
             json.dump(payload, handle, indent=2)
 
-    def get_admin_user_ids(self) -> List[int]:
-        """Return stored admin user IDs."""
-        payload = self._load_admin_store()
-        admin_ids: List[int] = []
-        for value in payload.get("admins", []):
-            try:
-                admin_ids.append(int(value))
-            except (TypeError, ValueError):
-                continue
-        return sorted(set(admin_ids))
-
-    def grant_admin_access(self, user_id: int) -> bool:
-        """Grant admin access to a user ID."""
-        if not user_id:
-            return False
-        admin_ids = set(self.get_admin_user_ids())
-        if user_id in admin_ids:
-            return True
-        admin_ids.add(int(user_id))
-        self._save_admin_store(list(admin_ids))
-        return True
+    @staticmethod
+    def get_admin_user_ids() -> List[int]:
+        """Return the IDs of users flagged as admins."""
+        return [
+            user_id
+            for (user_id,) in db.session.query(User.id)
+            .filter(User.is_admin.is_(True))
+            .order_by(User.id.asc())
+        ]
 
-    def revoke_admin_access(self, user_id: int) -> bool:
-        """Remove admin access for a user ID."""
+    @staticmethod
+    def _set_admin_flag(user_id: int, is_admin: bool) -> bool:
+        """Persist the admin flag for a user ID."""
         if not user_id:
             return False
-        admin_ids = set(self.get_admin_user_ids())
         try:
-            admin_id = int(user_id)
+            user = db.session.get(User, int(user_id))
         except (TypeError, ValueError):
             return False
-        if admin_id not in admin_ids:
+        if not user:
+            return False
+        if bool(user.is_admin) == is_admin:
             return True
-        admin_ids.remove(admin_id)
-        self._save_admin_store(list(admin_ids))
-        return True
 
-    def is_admin_user(self, user: Optional[User]) -> bool:
+        try:
+            user.is_admin = is_admin
+            db.session.commit()
+            return True
+        except Exception as exc:
+            current_app.logger.exception("Failed to update admin access: %s", exc)
+            db.session.rollback()
+            return False
+
+    def grant_admin_access(self, user_id: int) -> bool:
+        """Grant admin access to a user ID."""
+        return self._set_admin_flag(user_id, True)
+
+    def revoke_admin_access(self, user_id: int) -> bool:
+        """Remove admin access for a user ID."""
+        return self._set_admin_flag(user_id, False)
+
+    @staticmethod
+    def is_admin_user(user: Optional[User]) -> bool:
         """Return True if the user should be treated as an admin."""
         if not user:
             return False
         if (user.username or "").strip().lower() == "admin":
             return True
-        try:
-            return user.id in set(self.get_admin_user_ids())
-        except Exception:
+        # Admin access is only ever granted to teacher accounts, so students
+        # can be rejected without looking at the admin flag.
+        if user.role == "student":
             return False
+        return bool(getattr(user, "is_admin", False))
 
-    def is_super_admin_user(self, user: Optional[User]) -> bool:
+    @staticmethod
+    def is_super_admin_user(user: Optional[User]) -> bool:
         """Return True if the user is the original admin account."""
         if not user:
             return False
@@ -379,10 +402,16 @@ class UserService:
                 "error": "Password must be at least 8 characters.",
             }
 
-        if User.query.filter_by(email=email).first():
-            return {"success": False, "error": "Email already registered."}
-
-        if User.query.filter_by(username=username).first():
+        existing = (
+            db.session.query(User.username, User.email)
+            .filter(or_(User.email == email, User.username == username))
+            # Report an email clash ahead of a username clash, as before.
+            .order_by((User.email == email).desc())
+            .first()
+        )
+        if existing:
+            if existing.email == email:
+                return {"success": False, "error": "Email already registered."}
             return {"success": False, "error": "Username already taken."}
 
         try:
@@ -402,6 +431,13 @@ class UserService:
             db.session.commit()
 
             return {"success": True, "user": user}
+        except IntegrityError:
+            # A concurrent signup claimed the username or email first.
+            db.session.rollback()
+            return {
+                "success": False,
+                "error": "Username or email already registered.",
+            }
         except Exception as exc:
             current_app.logger.exception("Failed to register user: %s", exc)
             db.session.rollback()
@@ -415,163 +451,84 @@ class UserService:
         is created on-the-fly if it does not already exist when matching credentials are provided.
         """
         identifier = (identifier or "").strip()
-        lookup_email = None
-        lookup_username = None
-
-        if "@" in identifier:
-            lookup_email = identifier
-        else:
-            lookup_username = identifier
 
+        # Email and username both have unique indexes, so one OR lookup
+        # resolves either kind of identifier.
         user = None
-        if lookup_email:
-            user = User.query.filter_by(email=lookup_email).first()
-        if not user and lookup_username:
-            user = User.query.filter_by(username=lookup_username).first()
+        if identifier:
+            user = (
+                User.query.filter(
+                    or_(User.email == identifier, User.username == identifier)
+                )
+                .order_by((User.email == identifier).desc())
+                .first()
+            )
 
-        # Auto-provision a default admin account when the known credentials are provided.
-        admin_username = "admin"
-        admin_email = "admin@example.com"
-        admin_password = "admin123"
+        normalized_identifier = identifier.lower()
 
+        # Auto-provision a default admin account when the known credentials are provided.
         if (
             not user
-            and identifier.lower() in {admin_username, admin_email}
-            and password == admin_password
+            and normalized_identifier in self._ADMIN_IDENTIFIERS
+            and password == self.DEFAULT_ADMIN_PASSWORD
         ):
-            try:
-                password_hash = generate_password_hash(admin_password)
-                user = User(
-                    username=admin_username,
-                    email=admin_email,
-                    password_hash=password_hash,
-                    role="teacher",  # reuse teacher role; admin access is session-gated
-                    code=None,
-                    token_balance=0,
-                )
-                db.session.add(user)
-                db.session.commit()
-            except Exception as exc:
-                if current_app:
-                    current_app.logger.exception(
-                        "Failed to create default admin: %s", exc
-                    )
-                db.session.rollback()
-                user = None
+            user = self._provision_default_user(
+                username=self.DEFAULT_ADMIN_USERNAME,
+                email=self.DEFAULT_ADMIN_EMAIL,
+                password=self.DEFAULT_ADMIN_PASSWORD,
+                role="teacher",  # reuse teacher role; admin access is session-gated
+                token_balance=0,
+            )
 
         # Auto-provision a default test student account for demos.
-        student_username = "student"
-        student_email = "student@example.com"
-        student_password = "student123"
-
         if (
             not user
-            and identifier.lower() in {student_username, student_email}
-            and password == student_password
+            and normalized_identifier in self._STUDENT_IDENTIFIERS
+            and password == self.DEFAULT_STUDENT_PASSWORD
         ):
-            try:
-                password_hash = generate_password_hash(student_password)
-                user = User(
-                    username=student_username,
-                    email=student_email,
-                    password_hash=password_hash,
-                    role="student",
-                    code=None,
-                )
-                db.session.add(user)
-                db.session.commit()
-            except Exception as exc:
-                if current_app:
-                    current_app.logger.exception(
-                        "Failed to create default student: %s", exc
-                    )
-                db.session.rollback()
-                user = None
+            user = self._provision_default_user(
+                username=self.DEFAULT_STUDENT_USERNAME,
+                email=self.DEFAULT_STUDENT_EMAIL,
+                password=self.DEFAULT_STUDENT_PASSWORD,
+                role="student",
+            )
 
         if user and check_password_hash(user.password_hash, password):
             return user
         return None
 
-    def get_user(self, user_id: int) -> Optional[User]:
-        """Return a user by id."""
-        return User.query.get(user_id)
-
-    # --------------------------------------------------------------------- #
-    # Token Management
-    # --------------------------------------------------------------------- #
-
-    @staticmethod
-    def calculate_token_cost(code: str) -> int:
-        """Calculate the token cost for a code submission."""
-        if not code:
-            return 0
-        length = len(code)
-        if length <= 0:
-            return 0
-        tokens = math.floor((length / 250) + 0.5)
-        return max(1, tokens)
-
-    def get_token_balance(self, user_id: int) -> Optional[int]:
-        """Return the token balance for a user."""
-        user = User.query.get(user_id)
-        if not user:
-            return None
-        return int(user.token_balance or 0)
-
-    def spend_tokens(self, user_id: int, amount: int) -> Dict[str, object]:
-        """Spend tokens for a student user."""
-        if amount <= 0:
-            return {"success": False, "error": "Token cost must be positive."}
-
-        user = User.query.get(user_id)
-        if not user:
-            return {"success": False, "error": "User not found."}
-
-        if (user.token_balance or 0) < amount:
-            return {"success": False, "error": "Insufficient tokens."}
-
+    def _provision_default_user(
+        self, username: str, email: str, password: str, role: str, **fields
+    ) -> Optional[User]:
+        """Create a built-in demo account, tolerating a concurrent first login."""
         try:
-            user.token_balance = max(0, (user.token_balance or 0) - amount)
+            user = User(
+                username=username,
+                email=email,
+                password_hash=_default_account_password_hash(password),
+                role=role,
+                code=None,
+                **fields,
+            )
+            db.session.add(user)
             db.session.commit()
-            return {"success": True, "balance": user.token_balance}
-        except Exception as exc:
-            if current_app:
-                current_app.logger.exception("Failed to spend tokens: %s", exc)
+            return user
+        except IntegrityError:
+            # Another request created the account first; use that row.
             db.session.rollback()
-            return {"success": False, "error": "Failed to spend tokens."}
-
-    def adjust_student_tokens(
-        self, teacher_id: int, student_id: int, delta: int
-    ) -> Dict[str, object]:
-        """Adjust a student's token balance if they belong to the teacher."""
-        if delta == 0:
-            return {"success": False, "error": "Token adjustment cannot be zero."}
-
-        student = User.query.get(student_id)
-        if not student or student.role != "student":
-            return {"success": False, "error": "Student not found."}
-
-        belongs = (
-            User.query.join(ClassRegistration, ClassRegistration.student_id == User.id)
-            .join(Class, Class.id == ClassRegistration.class_id)
-            .filter(Class.teacher_id == teacher_id, User.id == student_id)
-            .first()
-        )
-        if not belongs:
-            return {
-                "success": False,
-                "error": "Student is not registered in your classes.",
-            }
-
-        try:
-            student.token_balance = max(0, (student.token_balance or 0) + delta)
-            db.session.commit()
-            return {"success": True, "balance": student.token_balance}
+            return User.query.filter_by(username=username).first()
         except Exception as exc:
             if current_app:
-                current_app.logger.exception("Failed to adjust tokens: %s", exc)
+                current_app.logger.exception(
+                    "Failed to create default %s account: %s", username, exc
+                )
             db.session.rollback()
-            return {"success": False, "error": "Failed to adjust tokens."}
+            return None
+
+    @staticmethod
+    def get_user(user_id: int) -> Optional[User]:
+        """Return a user by id."""
+        return User.query.get(user_id)
 
     # --------------------------------------------------------------------- #
     # Token Management
@@ -580,19 +537,24 @@ class UserService:
     @staticmethod
     def calculate_token_cost(code: str) -> int:
         """Calculate token cost based on code length (1 token per 250 chars)."""
-        length = len(code or "")
+        return UserService._token_cost_from_length(len(code or ""))
+
+    @staticmethod
+    def _token_cost_from_length(length: int) -> int:
+        """Return the token cost for a submission of ``length`` characters."""
         if length <= 0:
             return 0
-        raw_tokens = length / UserService.TOKEN_CHARS_PER
-        rounded_tokens = int(math.floor(raw_tokens + 0.5))
-        return max(1, rounded_tokens)
+        # Integer round-half-up of length / TOKEN_CHARS_PER.
+        chars_per = UserService.TOKEN_CHARS_PER
+        return max(1, (length + chars_per // 2) // chars_per)
 
-    def get_token_balance(self, user_id: int) -> Optional[int]:
+    @staticmethod
+    def get_token_balance(user_id: int) -> Optional[int]:
         """Return a user's token balance."""
-        user = self.get_user(user_id)
-        if not user:
-            return None
-        return int(user.token_balance or 0)
+        balance = (
+            db.session.query(User.token_balance).filter(User.id == user_id).scalar()
+        )
+        return None if balance is None else int(balance)
 
     def adjust_token_balance(self, user_id: int, delta: int) -> Dict[str, object]:
         """Adjust a user's token balance by delta (can be negative)."""
@@ -616,32 +578,47 @@ class UserService:
         if tokens <= 0:
             return {"success": False, "error": "Invalid token cost."}
 
-        user = self.get_user(user_id)
-        if not user:
-            return {"success": False, "error": "User not found."}
-
-        current_balance = int(user.token_balance or 0)
-        if current_balance < tokens:
-            return {
-                "success": False,
-                "error": "Insufficient tokens.",
-                "balance": current_balance,
-            }
+        # A single conditional UPDATE debits the balance atomically, so
+        # concurrent submissions cannot overspend.
+        statement = (
+            update(User)
+            .where(User.id == user_id, User.token_balance >= tokens)
+            .values(token_balance=User.token_balance - tokens)
+        )
+        use_returning = db.session.get_bind().dialect.update_returning
+        if use_returning:
+            statement = statement.returning(User.token_balance)
 
         try:
-            user.token_balance = current_balance - tokens
+            result = db.session.execute(statement)
+            new_balance = result.scalar_one_or_none() if use_returning else None
+            updated = new_balance is not None if use_returning else result.rowcount
             db.session.commit()
-            return {"success": True, "balance": user.token_balance}
         except Exception as exc:
             current_app.logger.exception("Failed to spend tokens: %s", exc)
             db.session.rollback()
             return {"success": False, "error": "Unable to spend tokens."}
 
+        if not updated:
+            current_balance = self.get_token_balance(user_id)
+            if current_balance is None:
+                return {"success": False, "error": "User not found."}
+            return {
+                "success": False,
+                "error": "Insufficient tokens.",
+                "balance": current_balance,
+            }
+
+        if new_balance is None:
+            new_balance = self.get_token_balance(user_id)
+        return {"success": True, "balance": new_balance}
+
     # --------------------------------------------------------------------- #
     # Teacher / Student Relationships
     # --------------------------------------------------------------------- #
 
-    def get_teacher_students(self, teacher_id: int) -> List[User]:
+    @staticmethod
+    def get_teacher_students(teacher_id: int) -> List[User]:
         """Return a list of distinct students enrolled in the teacher's classes."""
         return (
             User.query.join(ClassRegistration, ClassRegistration.student_id == User.id)
@@ -652,14 +629,22 @@ class UserService:
             .all()
         )
 
-    def can_teacher_manage_student(self, teacher_id: int, student_id: int) -> bool:
+    @staticmethod
+    def can_teacher_manage_student(teacher_id: int, student_id: int) -> bool:
         """Return True if the student belongs to the teacher's classes."""
         if teacher_id == student_id:
             return False
-        return any(
-            student.id == student_id
-            for student in self.get_teacher_students(teacher_id)
+        registration = (
+            db.session.query(ClassRegistration.id)
+            .join(Class, Class.id == ClassRegistration.class_id)
+            .join(User, User.id == ClassRegistration.student_id)
+            .filter(
+                Class.teacher_id == teacher_id,
+                ClassRegistration.student_id == student_id,
+                User.role == "student",
+            )
         )
+        return db.session.query(registration.exists()).scalar()
 
     def adjust_student_tokens(
         self, teacher_id: int, student_id: int, delta: int
@@ -673,28 +658,62 @@ class UserService:
 
         return self.adjust_token_balance(student_id, delta)
 
-    def remove_student_from_teacher(self, teacher_id: int, student_id: int) -> None:
+    @staticmethod
+    def remove_student_from_teacher(teacher_id: int, student_id: int) -> None:
         """Remove a student's registration from all of the teacher's classes."""
-        registrations = (
-            ClassRegistration.query.join(Class, Class.id == ClassRegistration.class_id)
-            .filter(
-                Class.teacher_id == teacher_id,
-                ClassRegistration.student_id == student_id,
-            )
-            .all()
+        teacher_class_ids = (
+            db.session.query(Class.id)
+            .filter(Class.teacher_id == teacher_id)
+            .scalar_subquery()
         )
 
-        if not registrations:
-            return
-
         try:
-            for registration in registrations:
-                db.session.delete(registration)
+            ClassRegistration.query.filter(
+                ClassRegistration.student_id == student_id,
+                ClassRegistration.class_id.in_(teacher_class_ids),
+            ).delete(synchronize_session=False)
             db.session.commit()
         except Exception as exc:
             current_app.logger.exception("Failed to remove student: %s", exc)
             db.session.rollback()
 
+    def _register_student_in_classes(
+        self, student_id: int, class_ids: List[int]
+    ) -> int:
+        """Insert missing class registrations and return how many were created."""
+        insert_factory = _UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
+        if insert_factory is not None:
+            # Let the unique (student_id, class_id) constraint skip existing
+            # rows in one statement.
+            statement = (
+                insert_factory(ClassRegistration)
+                .values(
+                    [
+                        {"student_id": student_id, "class_id": class_id}
+                        for class_id in class_ids
+                    ]
+                )
+                .on_conflict_do_nothing(index_elements=["student_id", "class_id"])
+            )
+            return db.session.execute(statement).rowcount
+
+        existing_ids = {
+            class_id
+            for (class_id,) in db.session.query(ClassRegistration.class_id)
+            .filter(
+                ClassRegistration.student_id == student_id,
+                ClassRegistration.class_id.in_(class_ids),
+            )
+            .all()
+        }
+        new_registrations = [
+            ClassRegistration(student_id=student_id, class_id=class_id)
+            for class_id in class_ids
+            if class_id not in existing_ids
+        ]
+        db.session.add_all(new_registrations)
+        return len(new_registrations)
+
     def add_student_via_code(
         self, student_id: int, teacher_code: str
     ) -> Dict[str, object]:
@@ -720,19 +739,9 @@ class UserService:
             db.session.commit()
             classes = [default_class]
 
-        created = 0
+        class_ids = [class_.id for class_ in classes]
         try:
-            for class_ in classes:
-                existing = ClassRegistration.query.filter_by(
-                    student_id=student_id, class_id=class_.id
-                ).first()
-                if existing:
-                    continue
-                db.session.add(
-                    ClassRegistration(student_id=student_id, class_id=class_.id)
-                )
-                created += 1
-
+            created = self._register_student_in_classes(student_id, class_ids)
             db.session.commit()
             message = (
                 f"Joined {teacher.username}'s classes."
@@ -745,10 +754,11 @@ class UserService:
             db.session.rollback()
             return {"success": False, "error": "Unable to join teacher classes."}
 
-    def get_student_classes(self, student_id: int) -> List[Dict[str, str]]:
+    @staticmethod
+    def get_student_classes(student_id: int) -> List[Dict[str, str]]:
         """Return all classes the student is registered in with teacher info."""
         results = (
-            db.session.query(Class, User.username.label("teacher_username"))
+            db.session.query(Class.name, User.username)
             .join(User, Class.teacher_id == User.id)
             .join(ClassRegistration, ClassRegistration.class_id == Class.id)
             .filter(ClassRegistration.student_id == student_id)
@@ -756,6 +766,6 @@ class UserService:
         )
 
         return [
-            {"class_name": class_.name, "teacher_username": teacher_username}
-            for class_, teacher_username in results
+            {"class_name": class_name, "teacher_username": teacher_username}
+            for class_name, teacher_username in results
         ]
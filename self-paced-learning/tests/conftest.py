@@ -0,0 +1,135 @@
+"""Shared pytest fixtures for the application test suite."""
+
+import itertools
+import os
+import sys
+from contextlib import ExitStack
+from functools import lru_cache
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pytest-xdist workers each get their own database and assignment store. The
+# URI must be in the environment before app.py builds its config (including
+# the in-memory engine options), so nothing in the suite can reach the bundled
+# instance database.
+WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+TEST_DATABASE_URI = (
+    f"sqlite:///file:memdb_{WORKER_ID}?mode=memory&cache=shared&uri=true"
+)
+os.environ["DATABASE_URL"] = TEST_DATABASE_URI
+
+from app import app  # noqa: E402
+from extensions import db  # noqa: E402
+from models import User  # noqa: E402
+from services import get_user_service  # noqa: E402
+from services.user_service import UserService  # noqa: E402
+
+UserService.TEACHER_TOPIC_ASSIGNMENTS_FILENAME = (
+    f"teacher_topic_assignments_{WORKER_ID}.json"
+)
+
+_TEACHER_NUMBERS = itertools.count(1)
+
+# The factory already returns a singleton; caching skips the lookup per test.
+_cached_user_service = lru_cache(maxsize=1)(get_user_service)
+
+
+# pysqlite defers BEGIN on its own, which breaks SAVEPOINT rollback; let
+# SQLAlchemy emit it instead.
+def _disable_pysqlite_transactions(dbapi_connection, _record):
+    dbapi_connection.isolation_level = None
+
+
+def _emit_begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _worker_assignment_store():
+    """Remove this worker's teacher assignment store when the run ends."""
+    yield
+    with app.app_context():
+        path = _cached_user_service()._get_teacher_topic_assignment_store_path()
+    Path(path).unlink(missing_ok=True)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _db():
+    """Build the schema once against this worker's in-memory SQLite database."""
+    with app.app_context():
+        engine = db.engine
+        event.listen(engine, "connect", _disable_pysqlite_transactions)
+        event.listen(engine, "begin", _emit_begin)
+        # Reconnect so the shared in-memory connection picks up the listeners.
+        engine.dispose()
+        db.create_all()
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture()
+def db_session(_db):
+    """Run each test inside a transaction that is rolled back afterwards."""
+    with app.app_context():
+        connection = _db.connect()
+        transaction = connection.begin()
+        # Commits in app code release a SAVEPOINT instead of the outer transaction.
+        db.session.configure(
+            bind=connection, join_transaction_mode="create_savepoint"
+        )
+        try:
+            yield db.session
+        finally:
+            db.session.remove()
+            db.session.configure(
+                bind=None, join_transaction_mode="conditional_savepoint"
+            )
+            transaction.rollback()
+            connection.close()
+
+
+@pytest.fixture(scope="session")
+def client(_db):
+    """Reuse one app context and test client for the whole run."""
+    app.config["TESTING"] = True
+    with ExitStack() as stack:
+        stack.enter_context(app.app_context())
+        yield app.test_client()
+
+
+@pytest.fixture(scope="module")
+def teacher(_db):
+    """Create one teacher per module, committed outside the per-test rollback."""
+    number = next(_TEACHER_NUMBERS)
+    with app.app_context():
+        teacher = User(
+            username=f"teacher_{number}",
+            email=f"teacher_{number}@example.com",
+            password_hash="fakehash",
+            role="teacher",
+            code=f"T{number:05d}",
+            token_balance=0,
+        )
+        db.session.add(teacher)
+        db.session.commit()
+        # Keep the loaded attributes usable once the app context is gone.
+        db.session.refresh(teacher)
+        db.session.expunge(teacher)
+
+    yield teacher
+
+    with app.app_context():
+        db.session.delete(db.session.merge(teacher))
+        db.session.commit()
+
+
+@pytest.fixture()
+def user_service():
+    with app.app_context():
+        return _cached_user_service()
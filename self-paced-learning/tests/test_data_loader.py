@@ -0,0 +1,293 @@
+"""Tests for JSON loading and tag migration in DataLoader."""
+
+import json
+import os
+
+import pytest
+
+from utils.data_loader import DataLoader, _iter_item_tags
+
+
+def _write_json(path, payload):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def _make_subject(data_root, subject="python"):
+    subject_dir = data_root / "subjects" / subject
+    _write_json(subject_dir / "subject_info.json", {"name": "Python"})
+    _write_json(
+        subject_dir / "subject_config.json",
+        {
+            "subtopics": {"functions": {"name": "Functions"}},
+            "allowed_keywords": ["Loops"],
+        },
+    )
+    _write_json(
+        subject_dir / "functions" / "lesson_plans.json",
+        {
+            "lessons": {
+                "intro": {"title": "Intro", "type": "initial", "tags": ["Def"]},
+                "review": {"title": "Review", "type": "remedial", "tags": ["return"]},
+            }
+        },
+    )
+    _write_json(
+        subject_dir / "functions" / "quiz_data.json",
+        {"quiz_title": "Functions Quiz", "questions": [{"tags": ["Scope"]}]},
+    )
+    return subject_dir
+
+
+def test_load_json_file_reports_missing_and_invalid_files(tmp_path):
+    loader = DataLoader(str(tmp_path))
+    valid = tmp_path / "valid.json"
+    invalid = tmp_path / "invalid.json"
+    valid.write_text('{"name": "Café"}', encoding="utf-8")
+    invalid.write_text("{not json", encoding="utf-8")
+
+    assert loader._load_json_file(str(valid)) == {"name": "Café"}
+    assert loader._load_json_file(str(invalid)) is None
+    assert loader._load_json_file(str(tmp_path / "missing.json")) is None
+
+
+def test_load_json_file_parses_large_files(tmp_path):
+    loader = DataLoader(str(tmp_path))
+    payload = {"questions": [{"question": "x" * 100, "tags": ["loops"]}] * 1000}
+    large = tmp_path / "large.json"
+    _write_json(large, payload)
+    assert large.stat().st_size >= 64 * 1024
+
+    assert loader._load_json_file(str(large)) == payload
+
+
+def test_migrate_tags_collects_lowercase_tags_from_content(tmp_path):
+    subject_dir = _make_subject(tmp_path)
+    loader = DataLoader(str(tmp_path))
+
+    assert loader.migrate_tags_for_subject("python")
+
+    config = json.loads((subject_dir / "subject_config.json").read_text("utf-8"))
+    assert config["allowed_tags"] == ["def", "loops", "return", "scope"]
+    assert "allowed_keywords" not in config
+    assert (subject_dir / "subject_config.json").read_text("utf-8").startswith(
+        '{\n  "subtopics"'
+    )
+
+
+def test_migrate_tags_scans_every_file_with_simdjson(tmp_path):
+    pytest.importorskip("simdjson")
+    subject_dir = _make_subject(tmp_path)
+    for subtopic, tag in (("functions", "a2"), ("loops", "b1")):
+        _write_json(
+            subject_dir / subtopic / "question_pool.json",
+            {"questions": [{"tags": [f"{tag}-pool"]}, {"tags": [tag]}]},
+        )
+    _write_json(
+        subject_dir / "loops" / "quiz_data.json", {"questions": [{"tags": ["b2"]}]}
+    )
+    loader = DataLoader(str(tmp_path))
+
+    assert loader.migrate_tags_for_subject("python")
+
+    config = json.loads((subject_dir / "subject_config.json").read_text("utf-8"))
+    assert config["allowed_tags"] == [
+        "a2",
+        "a2-pool",
+        "b1",
+        "b1-pool",
+        "b2",
+        "def",
+        "loops",
+        "return",
+        "scope",
+    ]
+
+
+def test_iter_item_tags_without_parser_reads_lists_and_mappings():
+    questions = json.dumps(
+        {"questions": [{"tags": ["A", "b"], "meta": {"tags": ["x"]}}, {"tags": []}]}
+    ).encode()
+    lessons = json.dumps({"lessons": {"week1.intro": {"tags": ["Def"]}}}).encode()
+
+    assert list(_iter_item_tags(questions, "questions")) == [["A", "b"]]
+    assert list(_iter_item_tags(lessons, "lessons")) == [["Def"]]
+
+
+def test_migrate_tags_leaves_config_alone_when_a_file_is_unreadable(tmp_path):
+    subject_dir = _make_subject(tmp_path)
+    config_path = subject_dir / "subject_config.json"
+    (subject_dir / "functions" / "question_pool.json").write_text("{not json")
+    before = config_path.read_text("utf-8")
+    loader = DataLoader(str(tmp_path))
+
+    assert not loader.migrate_tags_for_subject("python")
+    assert config_path.read_text("utf-8") == before
+
+
+def test_find_lessons_by_tags_filters_by_type(tmp_path):
+    _make_subject(tmp_path)
+    loader = DataLoader(str(tmp_path))
+
+    remedial = loader.find_remedial_lessons_by_tags("python", ["return", "def"])
+
+    assert [lesson["lesson_id"] for lesson in remedial] == ["review"]
+    assert remedial[0]["matching_tags"] == ["return"]
+    assert loader.find_lessons_by_tags("python", ["missing"]) == []
+
+
+def test_subject_keywords_follow_config_changes(tmp_path):
+    subject_dir = _make_subject(tmp_path)
+    config_path = subject_dir / "subject_config.json"
+    loader = DataLoader(str(tmp_path))
+
+    keywords = loader.get_subject_keywords("python")
+    assert keywords == ["loops"]
+    keywords.append("mutated")
+    assert loader.get_subject_keywords("python") == ["loops"]
+
+    _write_json(config_path, {"subtopics": {}, "allowed_tags": ["Recursion"]})
+    stat_result = config_path.stat()
+    os.utime(config_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1))
+
+    assert loader.get_subject_keywords("python") == ["recursion"]
+    assert loader.get_subject_keywords("missing") == []
+
+
+def test_find_lessons_by_tags_tolerates_non_string_tags(tmp_path):
+    subject_dir = _make_subject(tmp_path)
+    lesson = {"title": "Intro", "type": "initial", "tags": [7, "def"]}
+    _write_json(
+        subject_dir / "functions" / "lesson_plans.json", {"lessons": {"intro": lesson}}
+    )
+    loader = DataLoader(str(tmp_path))
+
+    matches = loader.find_lessons_by_tags("python", ["def"])
+    assert [match["lesson_id"] for match in matches] == ["intro"]
+    assert loader.find_lessons_by_tags("python", [7])[0]["matching_tags"] == [7]
+    assert loader.find_lessons_by_tags("python", [None]) == []
+
+
+def test_cache_evicts_least_recently_used_documents(tmp_path, monkeypatch):
+    _make_subject(tmp_path)
+    _make_subject(tmp_path, "calculus")
+    loader = DataLoader(str(tmp_path))
+    monkeypatch.setattr(DataLoader, "CACHE_MAX_ENTRIES", 2)
+
+    python_config = loader.load_subject_config("python")
+    loader.load_subject_info("python")
+    assert loader.load_subject_config("python") is python_config
+    loader.load_subject_config("calculus")
+
+    assert list(loader._cache) == ["python_config", "calculus_config"]
+    assert loader.load_subject_config("python") is python_config
+
+
+def test_cached_documents_reload_when_file_changes(tmp_path):
+    subject_dir = _make_subject(tmp_path)
+    config_path = subject_dir / "subject_config.json"
+    loader = DataLoader(str(tmp_path))
+
+    first = loader.load_subject_config("python")
+    assert loader.load_subject_config("python") is first
+
+    _write_json(config_path, {"subtopics": {}, "allowed_tags": ["new"]})
+    stat_result = config_path.stat()
+    os.utime(config_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1))
+
+    assert loader.load_subject_config("python")["allowed_tags"] == ["new"]
+
+
+def test_validate_subject_subtopic_rechecks_missing_subtopics(tmp_path):
+    subject_dir = _make_subject(tmp_path)
+    loader = DataLoader(str(tmp_path))
+
+    assert loader.validate_subject_subtopic("python", "functions")
+    assert not loader.validate_subject_subtopic("python", "loops")
+
+    _write_json(subject_dir / "loops" / "quiz_data.json", {"questions": []})
+    assert loader.validate_subject_subtopic("python", "loops")
+
+
+def test_lesson_tag_index_is_reused_until_lesson_plans_change(tmp_path):
+    subject_dir = _make_subject(tmp_path)
+    lessons_path = subject_dir / "functions" / "lesson_plans.json"
+    loader = DataLoader(str(tmp_path))
+
+    assert loader._get_lesson_tag_index("python") is loader._get_lesson_tag_index(
+        "python"
+    )
+
+    _write_json(
+        lessons_path,
+        {"lessons": {"extra": {"title": "Extra", "type": "remedial", "tags": ["def"]}}},
+    )
+    stat_result = lessons_path.stat()
+    os.utime(lessons_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1))
+
+    remedial = loader.find_remedial_lessons_by_tags("python", ["def"])
+    assert [lesson["lesson_id"] for lesson in remedial] == ["extra"]
+
+
+def test_warm_cache_preloads_subject_documents(tmp_path, monkeypatch):
+    _make_subject(tmp_path)
+    loader = DataLoader(str(tmp_path))
+    parsed = []
+    load_json_file = DataLoader._load_json_file
+
+    def counting_load(self, file_path, *args, **kwargs):
+        parsed.append(os.path.basename(file_path))
+        return load_json_file(self, file_path, *args, **kwargs)
+
+    monkeypatch.setattr(DataLoader, "_load_json_file", counting_load)
+    assert loader.warm_cache(max_workers=2) == 4
+    assert sorted(parsed) == [
+        "lesson_plans.json",
+        "quiz_data.json",
+        "subject_config.json",
+        "subject_info.json",
+    ]
+    assert set(loader._cache) == {
+        "python_config",
+        "python_info",
+        "python_functions_quiz",
+        "python_functions_lessons",
+    }
+
+    def fail(*args, **kwargs):
+        raise AssertionError("warm documents should not be re-read")
+
+    monkeypatch.setattr(DataLoader, "_load_json_file", fail)
+    assert loader.get_quiz_title("python", "functions") == "Functions Quiz"
+
+
+def test_migrate_all_subjects_tags_reports_each_subject(tmp_path):
+    for subject in ("python", "calculus"):
+        _make_subject(tmp_path, subject)
+    loader = DataLoader(str(tmp_path))
+
+    results = loader.migrate_all_subjects_tags()
+
+    assert results == {"python": True, "calculus": True}
+    config_path = tmp_path / "subjects" / "calculus" / "subject_config.json"
+    config = json.loads(config_path.read_text("utf-8"))
+    assert config["allowed_tags"] == ["def", "loops", "return", "scope"]
+
+
+def test_clear_cache_for_subject_leaves_prefixed_subjects(tmp_path):
+    _make_subject(tmp_path)
+    _make_subject(tmp_path, "python_advanced")
+    loader = DataLoader(str(tmp_path))
+    loader.warm_cache(max_workers=2)
+
+    loader.clear_cache_for_subject_subtopic("python", "functions")
+    assert "python_functions_quiz" not in loader._cache
+    assert "python_config" in loader._cache
+
+    loader.clear_cache_for_subject("python")
+    assert set(loader._cache) == {
+        "python_advanced_config",
+        "python_advanced_info",
+        "python_advanced_functions_quiz",
+        "python_advanced_functions_lessons",
+    }
@@ -0,0 +1,52 @@
+"""Tests for DataService caching behaviour."""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.data_service import DataService  # noqa: E402
+
+
+def _write_subject(data_root, subject_id, name):
+    subject_dir = data_root / "subjects" / subject_id
+    subject_dir.mkdir(parents=True)
+    (subject_dir / "subject_info.json").write_text(json.dumps({"name": name}))
+    (subject_dir / "subject_config.json").write_text(json.dumps({"subtopics": {}}))
+
+
+def test_discover_subjects_is_cached_until_invalidated(tmp_path):
+    _write_subject(tmp_path, "python", "Python")
+    data_service = DataService(str(tmp_path))
+
+    assert list(data_service.discover_subjects()) == ["python"]
+
+    _write_subject(tmp_path, "calculus", "Calculus")
+    assert list(data_service.discover_subjects()) == ["python"]
+
+    data_service.clear_cache_for_subject("calculus")
+    assert sorted(data_service.discover_subjects()) == ["calculus", "python"]
+
+
+def test_discover_subjects_returns_independent_copies(tmp_path):
+    _write_subject(tmp_path, "python", "Python")
+    data_service = DataService(str(tmp_path))
+
+    subjects = data_service.discover_subjects()
+    subjects["python"]["stats"] = {"lessons": 3}
+
+    assert "stats" not in data_service.discover_subjects()["python"]
+
+
+def test_subtopics_with_videos_lists_subtopics_with_video_files(tmp_path):
+    _write_subject(tmp_path, "python", "Python")
+    subject_dir = tmp_path / "subjects" / "python"
+    (subject_dir / "loops").mkdir()
+    (subject_dir / "loops" / "videos.json").write_text(json.dumps({"videos": []}))
+    (subject_dir / "functions").mkdir()
+
+    data_service = DataService(str(tmp_path))
+
+    assert data_service.subtopics_with_videos("python") == {"loops"}
+    assert data_service.subtopics_with_videos("missing") == set()
@@ -0,0 +1,309 @@
+"""Tests for session-backed progress tracking in ProgressService."""
+
+import os
+import sys
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import g, session  # noqa: E402
+
+from app import app  # noqa: E402
+from models import LessonProgress, User  # noqa: E402
+from services.progress_service import ProgressService  # noqa: E402
+
+
+@pytest.fixture()
+def progress_service():
+    app.config["TESTING"] = True
+    with app.test_request_context():
+        yield ProgressService()
+
+
+def test_get_all_progress_uses_progress_key_index(progress_service):
+    progress_service.mark_lesson_complete("python", "week_1", "intro")
+    progress_service.mark_video_complete("python", "functions", "video_1")
+    session["python_loops_notes"] = ["unrelated"]
+
+    progress = progress_service.get_all_progress()
+
+    assert progress == {
+        "python": {
+            "week_1": {"completed_lessons": ["intro"]},
+            "functions": {"watched_videos": ["video_1"]},
+        }
+    }
+    assert session[ProgressService.PROGRESS_SUBTOPIC_INDEX] == [
+        ["python", "week_1"],
+        ["python", "functions"],
+    ]
+
+
+def test_get_all_progress_scans_sessions_without_index(progress_service):
+    session["python_week_1_completed_lessons"] = ["intro"]
+
+    progress = progress_service.get_all_progress()
+
+    assert progress == {"python": {"week_1": {"completed_lessons": ["intro"]}}}
+
+
+def test_first_indexed_write_keeps_existing_progress(progress_service):
+    session["python_functions_completed_lessons"] = ["intro"]
+
+    progress_service.mark_video_complete("python", "loops", "v1")
+
+    assert progress_service.get_all_progress() == {
+        "python": {
+            "functions": {"completed_lessons": ["intro"]},
+            "loops": {"watched_videos": ["v1"]},
+        }
+    }
+
+
+def test_get_all_progress_keeps_underscored_subjects(progress_service):
+    progress_service.mark_lesson_complete("data_science", "week_1", "intro")
+
+    assert progress_service.get_all_progress() == {
+        "data_science": {"week_1": {"completed_lessons": ["intro"]}}
+    }
+
+
+def test_get_all_progress_skips_cleared_keys(progress_service):
+    progress_service.mark_lesson_complete("python", "week_1", "intro")
+    progress_service.clear_session_data("python", "week_1")
+
+    assert progress_service.get_all_progress() == {}
+
+
+def test_admin_override_skips_prerequisite_content_checks(
+    progress_service, monkeypatch
+):
+    def fail(*args, **kwargs):
+        raise AssertionError("content status should not be collected")
+
+    subject_config = {
+        "subtopics": {
+            "functions": {"name": "Functions"},
+            "arrays": {"name": "Arrays", "prerequisites": ["functions"]},
+        }
+    }
+    data_service = SimpleNamespace(load_subject_config=lambda subject: subject_config)
+    monkeypatch.setattr("services.get_data_service", lambda: data_service)
+    monkeypatch.setattr(progress_service, "_collect_subtopic_content_status", fail)
+    progress_service.set_admin_override(True)
+
+    status = progress_service.check_subtopic_prerequisites("python", "arrays")
+
+    assert status["has_prerequisites"]
+    assert status["prerequisites_met"]
+    assert status["missing_prerequisite_ids"] == []
+    assert status["prerequisite_details"][0]["is_complete"] is True
+
+
+def test_content_status_is_memoized_until_progress_changes(
+    progress_service, monkeypatch
+):
+    calls = []
+
+    def compute(subject, subtopic, lesson_type=None, include_missing=True):
+        calls.append((subject, subtopic, lesson_type, include_missing))
+        return {"all_content_complete": False}
+
+    monkeypatch.setattr(progress_service, "_compute_subtopic_content_status", compute)
+
+    first = progress_service._collect_subtopic_content_status(
+        "python", "functions", "initial"
+    )
+    second = progress_service._collect_subtopic_content_status(
+        "python", "functions", "initial"
+    )
+    assert first is second
+    assert len(calls) == 1
+
+    counts_only = progress_service._collect_subtopic_content_status(
+        "python", "functions", "initial", include_missing=False
+    )
+    assert counts_only is first
+    assert len(calls) == 1
+
+    progress_service.mark_lesson_complete("python", "functions", "intro")
+    progress_service._collect_subtopic_content_status("python", "functions", "initial")
+    assert len(calls) == 2
+
+
+def test_counts_only_content_status_skips_missing_titles(progress_service, monkeypatch):
+    lessons = [
+        {"id": "intro", "title": "Intro", "type": "initial"},
+        {"id": "review", "title": "Review", "type": "initial"},
+    ]
+    data_service = SimpleNamespace(
+        get_lesson_plans=lambda subject, subtopic, include_unlisted=True: lessons,
+        subtopics_with_videos=lambda subject: set(),
+    )
+    monkeypatch.setattr("services.get_data_service", lambda: data_service)
+    progress_service.mark_lesson_complete("python", "functions", "intro")
+
+    full = progress_service._collect_subtopic_content_status(
+        "python", "functions", "initial"
+    )
+    progress_service._invalidate_content_status_cache()
+    counts_only = progress_service._collect_subtopic_content_status(
+        "python", "functions", "initial", include_missing=False
+    )
+
+    assert full["missing_lessons"] == ["Review"]
+    assert counts_only["missing_lessons"] == []
+    assert counts_only["missing_items"] == []
+    for key in ("total_lessons", "lessons_completed", "all_content_complete"):
+        assert counts_only[key] == full[key]
+
+
+def test_session_made_permanent_once_after_request(progress_service):
+    progress_service.mark_lesson_complete("python", "week_1", "intro")
+    progress_service.mark_video_complete("python", "week_1", "video_1")
+
+    assert g._progress_modified is True
+    assert not session.permanent
+
+    app.process_response(app.response_class())
+
+    assert session.permanent
+    assert "_progress_modified" not in g
+
+
+def test_content_status_filters_lessons_by_type(progress_service, monkeypatch):
+    lessons = [
+        {"id": "a", "type": "initial"},
+        {"id": "b", "type": "remedial"},
+        {"id": "c", "type": "ALL"},
+        {"id": "d"},
+        {"id": "e", "type": "challenge"},
+    ]
+    data_service = SimpleNamespace(
+        get_lesson_plans=lambda subject, subtopic, include_unlisted=True: lessons,
+        subtopics_with_videos=lambda subject: set(),
+    )
+    monkeypatch.setattr("services.get_data_service", lambda: data_service)
+
+    def lesson_ids(lesson_type):
+        return progress_service._compute_subtopic_content_status(
+            "python", "functions", lesson_type
+        )["lesson_ids"]
+
+    assert lesson_ids(None) == ["a", "b", "c", "d", "e"]
+    assert lesson_ids("initial") == ["a", "c", "d"]
+    assert lesson_ids(" Remedial ") == ["b", "c"]
+    assert lesson_ids("challenge") == ["e"]
+
+
+def test_admin_override_status_follows_session_updates(progress_service):
+    assert progress_service.get_admin_override_status() is False
+
+    progress_service.set_admin_override(True)
+    assert progress_service.get_admin_override_status() is True
+
+    progress_service.clear_all_session_data()
+    assert progress_service.get_admin_override_status() is False
+
+
+def test_admin_mark_complete_records_unique_lesson_ids(progress_service):
+    assert progress_service.admin_mark_complete("python", "functions")
+
+    completed = progress_service.get_completed_lessons("python", "functions")
+    assert completed[0] == "python-functions-intro"
+    assert len(completed) == len(set(completed))
+    assert progress_service.is_admin_complete("python", "functions")
+    assert "functions" in progress_service.get_all_progress()["python"]
+
+
+def test_iter_content_ids_supports_dict_and_list_payloads():
+    assert list(ProgressService._iter_content_ids({"a": {}, "b": {}}, "lesson")) == [
+        "a",
+        "b",
+    ]
+    assert list(ProgressService._iter_content_ids([{"id": "x"}, {}], "video")) == [
+        "x",
+        "video_2",
+    ]
+
+
+@pytest.fixture()
+def student_with_progress(db_session):
+    token = uuid.uuid4().hex[:8]
+    student = User(
+        username=f"student_{token}",
+        email=f"student_{token}@example.com",
+        password_hash="fakehash",
+        role="student",
+    )
+    db_session.add(student)
+    db_session.flush()
+    for subject, subtopic, item_id in (
+        ("python", "functions", "python-functions-intro"),
+        ("progress_only", "topic_a", "lesson_a"),
+    ):
+        db_session.add(
+            LessonProgress(
+                student_id=student.id,
+                subject=subject,
+                subtopic=subtopic,
+                item_id=item_id,
+                item_type="lesson",
+                completed=True,
+            )
+        )
+    # Commits release a SAVEPOINT; the outer transaction still rolls back.
+    db_session.commit()
+    return student.id
+
+
+def test_student_progress_summary_groups_records_by_subject(student_with_progress):
+    summary = ProgressService().get_student_progress_summary(student_with_progress)
+
+    subjects = {subject["id"]: subject for subject in summary["subjects"]}
+    assert summary["completed_lessons"] >= 1
+
+    progress_only = subjects["progress_only"]
+    assert progress_only["completed_lessons"] == 1
+    assert progress_only["subtopics"][0]["id"] == "topic_a"
+    assert progress_only["subtopics"][0]["lessons"] == [
+        {"id": "lesson_a", "title": "Lesson A", "completed": True}
+    ]
+
+    python_subtopics = {
+        subtopic["id"]: subtopic for subtopic in subjects["python"]["subtopics"]
+    }
+    assert python_subtopics["functions"]["completed_lessons"] == 1
+
+
+def test_students_progress_summary_matches_single_student_summary(
+    student_with_progress,
+):
+    service = ProgressService()
+    summaries = service.get_students_progress_summary(
+        [student_with_progress, None, student_with_progress]
+    )
+    single = service.get_student_progress_summary(student_with_progress)
+
+    assert list(summaries) == [student_with_progress]
+    assert summaries[student_with_progress] == single
+
+
+def test_content_status_checks_single_videos_file_outside_request(monkeypatch):
+    checked = []
+    data_service = SimpleNamespace(
+        get_lesson_plans=lambda subject, subtopic, include_unlisted=True: [],
+        videos_file_exists=lambda subject, subtopic: checked.append(subtopic),
+    )
+    monkeypatch.setattr("services.get_data_service", lambda: data_service)
+
+    with app.app_context():
+        status = ProgressService()._collect_subtopic_content_status(
+            "python", "functions"
+        )
+
+    assert checked == ["functions"]
+    assert status["total_videos"] == 0
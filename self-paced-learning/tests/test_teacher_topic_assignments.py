@@ -1,75 +1,75 @@
 """Tests for scoped teacher subject assignments in admin authoring flows."""
 
-import os
-import sys
-import uuid
+import json
+from pathlib import Path
 
 import pytest
+from werkzeug.test import EnvironBuilder, run_wsgi_app
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app import app
+from services import get_user_service
 
-from app import app  # noqa: E402
-from extensions import db  # noqa: E402
-from models import User  # noqa: E402
-from services import get_user_service  # noqa: E402
+with app.app_context():
+    _ASSIGNMENT_STORE_PATH = Path(
+        get_user_service()._get_teacher_topic_assignment_store_path()  # noqa: SLF001
+    )
 
 
-@pytest.fixture()
-def client():
-    app.config["TESTING"] = True
-    with app.app_context():
-        with app.test_client() as test_client:
-            yield test_client
+@pytest.fixture(scope="module", autouse=True)
+def _assignable_subjects():
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(
+            "blueprints.admin_routes._list_assignable_subjects",
+            lambda: [{"subject": "python", "subject_name": "Python"}],
+        )
+        yield
 
 
-def _create_teacher_user() -> User:
-    token = uuid.uuid4().hex[:8]
-    teacher = User(
-        username=f"teacher_{token}",
-        email=f"teacher_{token}@example.com",
-        password_hash="fakehash",
-        role="teacher",
-        code=f"T{token[:5].upper()}",
-        token_balance=0,
-    )
-    db.session.add(teacher)
-    db.session.commit()
-    return teacher
+@pytest.fixture(scope="module")
+def admin_cookie(client):
+    """Sign an admin session once and return its cookie header."""
+    with client.session_transaction() as sess:
+        sess.update({"user_id": 999999, "username": "admin", "is_admin": True})
+    session_cookie = client.get_cookie(app.config["SESSION_COOKIE_NAME"])
+    return f"{session_cookie.key}={session_cookie.value}"
 
 
 def _clear_assignment_store() -> None:
-    user_service = get_user_service()
-    path = user_service._get_teacher_topic_assignment_store_path()  # noqa: SLF001
-    if os.path.exists(path):
-        os.remove(path)
+    _ASSIGNMENT_STORE_PATH.unlink(missing_ok=True)
 
 
-def test_admin_can_assign_and_unassign_teacher_subject(client, monkeypatch):
-    with app.app_context():
-        teacher = _create_teacher_user()
-        _clear_assignment_store()
-
-    with client.session_transaction() as sess:
-        sess["user_id"] = 999999
-        sess["username"] = "admin"
-        sess["is_admin"] = True
-        sess["role"] = "admin"
-
-    monkeypatch.setattr(
-        "blueprints.admin_routes._list_assignable_subjects",
-        lambda: [{"subject": "python", "subject_name": "Python"}],
+def _dispatch(cookie, method, body=None):
+    """Call the assignment endpoint via ``app.wsgi_app`` with a session cookie."""
+    builder = EnvironBuilder(
+        path="/admin/teacher-topic-assignments",
+        method=method,
+        data=body,
+        content_type="application/json" if body is not None else None,
+        headers={"Cookie": cookie},
     )
+    try:
+        app_iter, status, _headers = run_wsgi_app(
+            app.wsgi_app, builder.get_environ(), buffered=True
+        )
+    finally:
+        builder.close()
+    return int(status.split(" ", 1)[0]), json.loads(b"".join(app_iter))
 
-    assign_response = client.post(
-        "/admin/teacher-topic-assignments",
-        json={"teacher_id": teacher.id, "subject": "python"},
-    )
-    assert assign_response.status_code == 200
-    assert assign_response.get_json().get("success") is True
 
-    list_response = client.get("/admin/teacher-topic-assignments")
-    assert list_response.status_code == 200
-    payload = list_response.get_json()
+def test_teacher_topic_assignment_lifecycle(
+    client, db_session, teacher, user_service, admin_cookie
+):
+    _clear_assignment_store()
+
+    # Serialized once and reused for both the assign and delete requests.
+    assignment = json.dumps({"teacher_id": teacher.id, "subject": "python"}).encode()
+
+    status, payload = _dispatch(admin_cookie, "POST", assignment)
+    assert status == 200
+    assert payload.get("success") is True
+
+    status, payload = _dispatch(admin_cookie, "GET")
+    assert status == 200
     assert payload.get("success") is True
     assignments = payload.get("assignments", [])
     assert any(
@@ -78,20 +78,15 @@ def test_admin_can_assign_and_unassign_teacher_subject(client, monkeypatch):
         for item in assignments
     )
 
-    delete_response = client.delete(
-        "/admin/teacher-topic-assignments",
-        json={"teacher_id": teacher.id, "subject": "python"},
-    )
-    assert delete_response.status_code == 200
-    assert delete_response.get_json().get("success") is True
-
+    status, payload = _dispatch(admin_cookie, "DELETE", assignment)
+    assert status == 200
+    assert payload.get("success") is True
 
-def test_scoped_teacher_admin_routes_are_limited_to_assigned_subject(client):
-    with app.app_context():
-        teacher = _create_teacher_user()
-        _clear_assignment_store()
-        user_service = get_user_service()
-        user_service.assign_teacher_topic(teacher.id, "python")
+    # Re-assign the subject and switch to the teacher to check scoping.
+    user_service.assign_teacher_topic(teacher.id, "python")
+    admin_subtopics = client.get("/api/subjects/python/subtopics").get_json()[
+        "subtopics"
+    ]
 
     with client.session_transaction() as sess:
         sess["user_id"] = teacher.id
@@ -99,25 +94,11 @@ def test_scoped_teacher_admin_routes_are_limited_to_assigned_subject(client):
         sess["is_admin"] = False
         sess["role"] = "teacher"
 
-    allowed = client.get("/admin/quiz/python/functions")
-    denied = client.get("/admin/quiz/python/loops")
-
-    assert allowed.status_code == 200
-    assert denied.status_code == 403
-
-
-def test_scoped_teacher_tag_and_subtopic_apis_are_subject_scoped(client):
-    with app.app_context():
-        teacher = _create_teacher_user()
-        _clear_assignment_store()
-        user_service = get_user_service()
-        user_service.assign_teacher_topic(teacher.id, "python")
-
-    with client.session_transaction() as sess:
-        sess["user_id"] = teacher.id
-        sess["username"] = teacher.username
-        sess["is_admin"] = False
-        sess["role"] = "teacher"
+    # Scoping is per subject: every subtopic of an assigned subject is open,
+    # while other subjects are refused.
+    for subtopic in ("functions", "loops"):
+        assert client.get(f"/admin/quiz/python/{subtopic}").status_code == 200
+    assert client.get("/admin/quiz/calculus/functions").status_code == 403
 
     allowed_tags = client.get("/api/subjects/python/tags")
     denied_tags = client.get("/api/subjects/calculus/tags")
@@ -126,7 +107,5 @@ def test_scoped_teacher_tag_and_subtopic_apis_are_subject_scoped(client):
 
     subtopics_response = client.get("/api/subjects/python/subtopics")
     assert subtopics_response.status_code == 200
-    subtopics_payload = subtopics_response.get_json()
-    subtopics = subtopics_payload.get("subtopics", {})
-    assert "functions" in subtopics
-    assert all(subtopic_id == "functions" for subtopic_id in subtopics.keys())
+    subtopics = subtopics_response.get_json().get("subtopics", {})
+    assert subtopics and subtopics.keys() == admin_subtopics.keys()
@@ -1,29 +1,30 @@
 """Unit tests for token cost calculation."""
 
-import os
-import sys
-import unittest
+import math
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
 
 from services.user_service import UserService
 
+ROUNDING_CASES = [(1, 1), (249, 1), (250, 1), (375, 2), (499, 2), (500, 2), (625, 3)]
 
-class TestTokenCost(unittest.TestCase):
-    def setUp(self):
-        self.user_service = UserService()
 
-    def test_minimum_token_cost(self):
-        self.assertEqual(self.user_service.calculate_token_cost("a"), 1)
+@pytest.mark.parametrize("length, expected", ROUNDING_CASES)
+def test_token_cost_rounding_rules(length, expected):
+    assert UserService._token_cost_from_length(length) == expected  # noqa: SLF001
 
-    def test_rounding_rules(self):
-        self.assertEqual(self.user_service.calculate_token_cost("a" * 249), 1)
-        self.assertEqual(self.user_service.calculate_token_cost("a" * 250), 1)
-        self.assertEqual(self.user_service.calculate_token_cost("a" * 375), 2)
-        self.assertEqual(self.user_service.calculate_token_cost("a" * 499), 2)
-        self.assertEqual(self.user_service.calculate_token_cost("a" * 500), 2)
-        self.assertEqual(self.user_service.calculate_token_cost("a" * 625), 3)
 
+def test_calculate_token_cost_uses_code_length():
+    assert UserService.calculate_token_cost("a" * 375) == 2
+    assert UserService.calculate_token_cost("") == 0
+    assert UserService.calculate_token_cost(None) == 0
 
-if __name__ == "__main__":
-    unittest.main()
+
+def test_token_cost_matches_round_half_up_for_length_sweep():
+    lengths = range(1, 5000)
+    per = UserService.TOKEN_CHARS_PER
+    expected = [max(1, math.floor(length / per + 0.5)) for length in lengths]
+
+    actual = list(map(UserService._token_cost_from_length, lengths))  # noqa: SLF001
+
+    assert actual == expected
@@ -0,0 +1,217 @@
+"""Tests for teacher/student relationships in UserService."""
+
+import os
+import uuid
+from itertools import chain, repeat
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app import app
+from extensions import db
+from models import Class, ClassRegistration, User
+from services.user_service import UserService
+
+# Shared across tests; only the store-path test needs a fresh instance.
+USER_SERVICE = UserService()
+
+
+@pytest.fixture(name="ids")
+def teacher_with_classes(db_session):
+    token = uuid.uuid4().hex[:8]
+    teacher = User(
+        username=f"teacher_{token}",
+        email=f"teacher_{token}@example.com",
+        password_hash="fakehash",
+        role="teacher",
+        code=f"T{token[:7].upper()}",
+    )
+    student = User(
+        username=f"student_{token}",
+        email=f"student_{token}@example.com",
+        password_hash="fakehash",
+        role="student",
+    )
+    db_session.add_all([teacher, student])
+    db_session.flush()
+    classes = [
+        Class(
+            name=f"Class {index}",
+            code=f"C{index}{token[:7]}",
+            teacher_id=teacher.id,
+        )
+        for index in range(2)
+    ]
+    db_session.add_all(classes)
+    # Commits release a SAVEPOINT; the outer transaction still rolls back.
+    db_session.commit()
+    return {
+        "teacher_id": teacher.id,
+        "teacher_code": teacher.code,
+        "student_id": student.id,
+        "class_ids": [class_.id for class_ in classes],
+    }
+
+
+def _registered_class_ids(student_id):
+    return {
+        registration.class_id
+        for registration in ClassRegistration.query.filter_by(student_id=student_id)
+    }
+
+
+def test_add_student_via_code_registers_missing_classes_only(ids):
+    db.session.add(
+        ClassRegistration(student_id=ids["student_id"], class_id=ids["class_ids"][0])
+    )
+    db.session.commit()
+
+    result = USER_SERVICE.add_student_via_code(ids["student_id"], ids["teacher_code"])
+    assert result["success"]
+    assert result["message"].startswith("Joined")
+    assert _registered_class_ids(ids["student_id"]) == set(ids["class_ids"])
+
+    teacher_username = db.session.get(User, ids["teacher_id"]).username
+    assert sorted(USER_SERVICE.get_student_classes(ids["student_id"]), key=str) == [
+        {"class_name": "Class 0", "teacher_username": teacher_username},
+        {"class_name": "Class 1", "teacher_username": teacher_username},
+    ]
+
+    repeat = USER_SERVICE.add_student_via_code(ids["student_id"], ids["teacher_code"])
+    assert repeat["message"] == ("You are already enrolled in this teacher's classes.")
+
+
+def test_remove_student_from_teacher_deletes_all_registrations(ids):
+    USER_SERVICE.add_student_via_code(ids["student_id"], ids["teacher_code"])
+    assert USER_SERVICE.can_teacher_manage_student(ids["teacher_id"], ids["student_id"])
+
+    USER_SERVICE.remove_student_from_teacher(ids["teacher_id"], ids["student_id"])
+
+    assert _registered_class_ids(ids["student_id"]) == set()
+    assert not USER_SERVICE.can_teacher_manage_student(
+        ids["teacher_id"], ids["student_id"]
+    )
+
+
+def test_admin_access_is_stored_on_user(ids):
+    teacher = db.session.get(User, ids["teacher_id"])
+    assert not USER_SERVICE.is_admin_user(teacher)
+
+    assert USER_SERVICE.grant_admin_access(ids["teacher_id"])
+    assert USER_SERVICE.is_admin_user(db.session.get(User, ids["teacher_id"]))
+    assert ids["teacher_id"] in USER_SERVICE.get_admin_user_ids()
+
+    assert USER_SERVICE.revoke_admin_access(ids["teacher_id"])
+    assert not USER_SERVICE.is_admin_user(db.session.get(User, ids["teacher_id"]))
+    assert not USER_SERVICE.grant_admin_access(-1)
+
+
+def test_students_are_never_admins(ids):
+    student = db.session.get(User, ids["student_id"])
+    student.is_admin = True
+    db.session.commit()
+
+    assert not USER_SERVICE.is_admin_user(db.session.get(User, ids["student_id"]))
+
+
+def test_unique_teacher_code_skips_taken_candidates(ids, monkeypatch):
+    # The whole first batch collides, so a second, larger batch is drawn.
+    candidates = chain(
+        repeat(ids["teacher_code"], UserService.CODE_CANDIDATE_BATCH),
+        repeat("FRESH1"),
+    )
+    monkeypatch.setattr(USER_SERVICE, "_generate_class_code", lambda: next(candidates))
+    assert USER_SERVICE._generate_unique_teacher_code() == "FRESH1"
+
+
+def test_generated_class_codes_use_code_alphabet():
+    code = USER_SERVICE._generate_class_code()
+
+    assert len(code) == UserService.CODE_LENGTH
+    assert set(code) <= set(UserService._CODE_ALPHABET)
+
+
+def test_spend_tokens_debits_atomically(ids):
+    student = db.session.get(User, ids["student_id"])
+    student.token_balance = 5
+    db.session.commit()
+
+    assert USER_SERVICE.spend_tokens(ids["student_id"], 3) == {
+        "success": True,
+        "balance": 2,
+    }
+    assert db.session.get(User, ids["student_id"]).token_balance == 2
+
+    insufficient = USER_SERVICE.spend_tokens(ids["student_id"], 3)
+    assert insufficient["error"] == "Insufficient tokens."
+    assert insufficient["balance"] == 2
+
+    assert USER_SERVICE.spend_tokens(-1, 1)["error"] == "User not found."
+
+
+def test_get_token_balance_reads_balance_column(ids):
+    student = db.session.get(User, ids["student_id"])
+    student.token_balance = 4
+    db.session.commit()
+
+    assert USER_SERVICE.get_token_balance(ids["student_id"]) == 4
+    assert USER_SERVICE.get_token_balance(-1) is None
+
+
+def test_provision_default_user_reuses_concurrently_created_account(ids):
+    student = db.session.get(User, ids["student_id"])
+    username, email = student.username, student.email
+
+    user = USER_SERVICE._provision_default_user(
+        username=username, email=email, password="student123", role="student"
+    )
+
+    assert user is not None
+    assert user.id == ids["student_id"]
+
+
+def test_register_user_reports_existing_email_before_username(ids):
+    student = db.session.get(User, ids["student_id"])
+    teacher = db.session.get(User, ids["teacher_id"])
+
+    by_email = USER_SERVICE.register_user(
+        teacher.username, student.email, "password123", "student"
+    )
+    by_username = USER_SERVICE.register_user(
+        student.username, "unused@example.com", "password123", "student"
+    )
+
+    assert by_email == {"success": False, "error": "Email already registered."}
+    assert by_username == {"success": False, "error": "Username already taken."}
+
+
+def test_authenticate_accepts_username_or_email(ids):
+    student = db.session.get(User, ids["student_id"])
+    student.password_hash = generate_password_hash("password123")
+    db.session.commit()
+
+    by_username = USER_SERVICE.authenticate(student.username, "password123")
+    by_email = USER_SERVICE.authenticate(f"  {student.email} ", "password123")
+    wrong_password = USER_SERVICE.authenticate(student.email, "nope")
+
+    assert by_username.id == ids["student_id"]
+    assert by_email.id == ids["student_id"]
+    assert wrong_password is None
+
+
+def test_assignment_store_directory_is_created_once(monkeypatch):
+    service = UserService()
+    calls = []
+    real_makedirs = os.makedirs
+
+    def tracking_makedirs(path, *args, **kwargs):
+        calls.append(path)
+        return real_makedirs(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "makedirs", tracking_makedirs)
+    with app.app_context():
+        first = service._get_teacher_topic_assignment_store_path()
+        second = service._get_teacher_topic_assignment_store_path()
+
+    assert first == second
+    assert calls == [app.instance_path]
@@ -4,14 +4,165 @@ Handles error cases and provides caching for performance.
 """
 
 import json
+import mmap
 import os
-from typing import Dict, List, Optional, Any
-from flask import current_app
+import sys
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from operator import itemgetter
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+from flask import current_app, has_app_context
+
+try:  # orjson is an optional, much faster drop-in for the stdlib parser.
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+try:  # pysimdjson lets the tag scan skip materializing whole documents.
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# (st_mtime_ns, st_size) of a data file when it was cached.
+_FileSignature = Tuple[int, int]
+_CacheEntry = Tuple[Optional[_FileSignature], Dict[str, Any]]
+# (sort rank, lesson metadata, lowercased type, tag set) per indexed lesson.
+_TagIndexRecord = Tuple[int, Dict[str, Any], str, FrozenSet[str]]
+
+# (filename, item collection, description) scanned for tags in each subtopic.
+_TAG_SOURCES = (
+    ("lesson_plans.json", "lessons", "remedial lesson plans"),
+    ("quiz_data.json", "questions", "quiz data"),
+    ("question_pool.json", "questions", "question pool"),
+)
+
+# Per-subtopic documents preloaded by DataLoader.warm_cache(): cache file type
+# -> filename.
+_WARM_SUBTOPIC_FILES = (
+    ("quiz", "quiz_data.json"),
+    ("questions", "question_pool.json"),
+    ("lessons", "lesson_plans.json"),
+)
+
+# Files at least this large are parsed in place from a memory map (orjson only).
+_MMAP_MIN_BYTES = 64 * 1024
+
+# A subtopic directory counts as valid when it holds any of these files.
+_SUBTOPIC_DATA_FILES = frozenset(
+    ("quiz_data.json", "lesson_plans.json", "question_pool.json", "videos.json")
+)
+
+
+def _entry_names(directory: str) -> Set[str]:
+    """Return the names in a directory with one scandir call (empty if unreadable)."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+
+def _app_logger() -> Optional[Any]:
+    """Return the current Flask app's logger, or None outside an app context."""
+    return current_app.logger if has_app_context() else None
+
+
+def _read_bytes(file_path: str) -> bytes:
+    """Read a whole file with unbuffered I/O (one read sized from fstat)."""
+    with open(file_path, "rb", buffering=0) as f:
+        return f.read()
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse a UTF-8 encoded JSON document."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _prefetch(file_path: str) -> None:
+    """Ask the kernel to start reading a file into the page cache, if supported."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _load_document(file_path: str) -> Any:
+    """Parse a JSON file, handing large files to orjson as a memory map."""
+    with open(file_path, "rb", buffering=0) as f:
+        if orjson is not None and os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mmap, "MADV_WILLNEED"):
+                    mapped.madvise(mmap.MADV_WILLNEED)
+                with memoryview(mapped) as view:
+                    return orjson.loads(view)
+        return _loads(f.read())
+
+
+def _iter_item_tags(
+    raw: bytes, collection: str, parser: Optional[Any] = None
+) -> Iterator[Any]:
+    """Yield the ``tags`` of every item under ``collection`` in a JSON document.
+
+    When a pysimdjson parser is supplied the document is parsed lazily, so
+    only the fields visited here are turned into Python objects. Tags are
+    yielded as plain lists so no proxy into the parser's buffer outlives this
+    generator; pysimdjson refuses to reuse a parser while one exists.
+    """
+    document = parser.parse(raw) if parser is not None else _loads(raw)
+    items = document.get(collection) or ()
+    if hasattr(items, "values"):
+        items = items.values()
+    for item in items:
+        tags = item.get("tags")
+        if tags:
+            yield list(tags)
+
+
+def _intern_tags(tags: Any) -> FrozenSet[Any]:
+    """Return tags as a frozenset, interning the string ones."""
+    return frozenset(
+        sys.intern(tag) if isinstance(tag, str) else tag for tag in tags
+    )
+
+
+def _dumps_pretty(data: Any) -> bytes:
+    """Serialize data as two-space indented UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
 
 
 class DataLoader:
     """Handles loading of subject and subtopic data from JSON files."""
 
+    # Upper bound on cached documents; least recently used entries go first.
+    CACHE_MAX_ENTRIES = 256
+    # How long a positive validate_subject_subtopic() result is trusted.
+    VALIDATION_TTL_SECONDS = 5.0
+
+    __slots__ = (
+        "data_root",
+        "_subjects_root",
+        "_subject_path",
+        "_cache",
+        "_key_index",
+        "_valid_subtopics",
+        "_tag_indexes",
+        "_subject_keywords",
+    )
+
     def __init__(self, data_root_path: str):
         """
         Initialize the DataLoader with the root data path.
@@ -33,7 +184,21 @@ class DataLoader:
                 resolved_root = candidate
 
         self.data_root = resolved_root
-        self._cache = {}
+        self._subjects_root = os.path.join(resolved_root, "subjects")
+        # _subject_path(subject[, subtopic]) -> directory, memoised per loader.
+        self._subject_path = lru_cache(maxsize=512)(
+            partial(os.path.join, self._subjects_root)
+        )
+        # Entries are (file signature, document); a None signature never expires.
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        # (subject, subtopic) and (subject, None) -> cache keys, for targeted
+        # invalidation. Keys evicted by the LRU may linger here; popping them
+        # from the cache later is a no-op.
+        self._key_index: Dict[Tuple[str, Optional[str]], Set[str]] = defaultdict(set)
+        self._valid_subtopics: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._tag_indexes: Dict[str, Tuple[Any, Dict[str, List[_TagIndexRecord]]]] = {}
+        # subject -> (config document the tags came from, lowercased tags).
+        self._subject_keywords: Dict[str, Tuple[Dict[str, Any], Tuple[str, ...]]] = {}
 
     def _load_json_file(
         self, file_path: str, allow_missing: bool = False
@@ -48,24 +213,24 @@ class DataLoader:
             Dictionary containing JSON data, or None if file doesn't exist or is corrupted
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return _load_document(file_path)
         except FileNotFoundError:
-            if current_app:
+            logger = _app_logger()
+            if logger:
                 if allow_missing:
-                    current_app.logger.debug(
-                        f"Optional JSON file not found: {file_path}"
-                    )
+                    logger.debug(f"Optional JSON file not found: {file_path}")
                 else:
-                    current_app.logger.error(f"JSON file not found: {file_path}")
+                    logger.error(f"JSON file not found: {file_path}")
             return None
         except json.JSONDecodeError as e:
-            if current_app:
-                current_app.logger.error(f"Invalid JSON in file {file_path}: {e}")
+            logger = _app_logger()
+            if logger:
+                logger.error(f"Invalid JSON in file {file_path}: {e}")
             return None
         except Exception as e:
-            if current_app:
-                current_app.logger.error(f"Error loading JSON file {file_path}: {e}")
+            logger = _app_logger()
+            if logger:
+                logger.error(f"Error loading JSON file {file_path}: {e}")
             return None
 
     def _get_cache_key(
@@ -79,6 +244,68 @@ class DataLoader:
         else:
             return subject
 
+    @staticmethod
+    def _file_signature(file_path: str) -> Optional[_FileSignature]:
+        """Return (mtime_ns, size) for a file, or None when it cannot be read."""
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            return None
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    def _cache_get(self, cache_key: str) -> Optional[_CacheEntry]:
+        """Return a cached (signature, document) entry and mark it recently used."""
+        try:
+            entry = self._cache[cache_key]
+            self._cache.move_to_end(cache_key)
+        except KeyError:
+            return None
+        return entry
+
+    def _cache_set(
+        self,
+        cache_key: str,
+        value: Dict[str, Any],
+        signature: Optional[_FileSignature] = None,
+        subject: Optional[str] = None,
+        subtopic: Optional[str] = None,
+    ) -> None:
+        """Cache a document, evicting the least recently used beyond the cap."""
+        self._cache[cache_key] = (signature, value)
+        self._cache.move_to_end(cache_key)
+        if subject is not None:
+            self._key_index[(subject, None)].add(cache_key)
+            if subtopic is not None:
+                self._key_index[(subject, subtopic)].add(cache_key)
+        while len(self._cache) > self.CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
+    def _load_cached_json(
+        self,
+        cache_key: str,
+        file_path: str,
+        subject: str,
+        subtopic: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load a JSON file through the cache.
+
+        A cached document is reused while the file's mtime and size are
+        unchanged, so edits on disk are picked up with a single stat call.
+        Failed loads are not cached.
+        """
+        signature = self._file_signature(file_path)
+        entry = self._cache_get(cache_key)
+        if entry is not None and signature is not None and entry[0] == signature:
+            return entry[1]
+
+        data = self._load_json_file(file_path)
+        if data:
+            self._cache_set(cache_key, data, signature, subject, subtopic)
+        else:
+            self._cache.pop(cache_key, None)
+        return data
+
     def load_subject_config(self, subject: str) -> Optional[Dict[str, Any]]:
         """
         Load subject configuration (keywords, settings, etc.).
@@ -89,20 +316,10 @@ class DataLoader:
         Returns:
             Dictionary containing subject config, or None if not found
         """
-        cache_key = self._get_cache_key(subject, file_type="config")
-
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-
-        config_path = os.path.join(
-            self.data_root, "subjects", subject, "subject_config.json"
+        config_path = os.path.join(self._subject_path(subject), "subject_config.json")
+        return self._load_cached_json(
+            self._get_cache_key(subject, file_type="config"), config_path, subject
         )
-        config_data = self._load_json_file(config_path)
-
-        if config_data:
-            self._cache[cache_key] = config_data
-
-        return config_data
 
     def load_subject_info(self, subject: str) -> Optional[Dict[str, Any]]:
         """
@@ -114,20 +331,10 @@ class DataLoader:
         Returns:
             Dictionary containing subject info, or None if not found
         """
-        cache_key = self._get_cache_key(subject, file_type="info")
-
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-
-        info_path = os.path.join(
-            self.data_root, "subjects", subject, "subject_info.json"
+        info_path = os.path.join(self._subject_path(subject), "subject_info.json")
+        return self._load_cached_json(
+            self._get_cache_key(subject, file_type="info"), info_path, subject
         )
-        info_data = self._load_json_file(info_path)
-
-        if info_data:
-            self._cache[cache_key] = info_data
-
-        return info_data
 
     def load_quiz_data(self, subject: str, subtopic: str) -> Optional[Dict[str, Any]]:
         """
@@ -140,20 +347,12 @@ class DataLoader:
         Returns:
             Dictionary containing quiz data, or None if not found
         """
-        cache_key = self._get_cache_key(subject, subtopic, "quiz")
-
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-
         quiz_path = os.path.join(
-            self.data_root, "subjects", subject, subtopic, "quiz_data.json"
+            self._subject_path(subject, subtopic), "quiz_data.json"
+        )
+        return self._load_cached_json(
+            self._get_cache_key(subject, subtopic, "quiz"), quiz_path, subject, subtopic
         )
-        quiz_data = self._load_json_file(quiz_path)
-
-        if quiz_data:
-            self._cache[cache_key] = quiz_data
-
-        return quiz_data
 
     def load_question_pool(
         self, subject: str, subtopic: str
@@ -168,20 +367,15 @@ class DataLoader:
         Returns:
             Dictionary containing question pool, or None if not found
         """
-        cache_key = self._get_cache_key(subject, subtopic, "questions")
-
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-
         pool_path = os.path.join(
-            self.data_root, "subjects", subject, subtopic, "question_pool.json"
+            self._subject_path(subject, subtopic), "question_pool.json"
+        )
+        return self._load_cached_json(
+            self._get_cache_key(subject, subtopic, "questions"),
+            pool_path,
+            subject,
+            subtopic,
         )
-        pool_data = self._load_json_file(pool_path)
-
-        if pool_data:
-            self._cache[cache_key] = pool_data
-
-        return pool_data
 
     def load_lesson_plans(
         self, subject: str, subtopic: str
@@ -196,20 +390,15 @@ class DataLoader:
         Returns:
             Dictionary containing lesson plans, or None if not found
         """
-        cache_key = self._get_cache_key(subject, subtopic, "lessons")
-
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-
         lessons_path = os.path.join(
-            self.data_root, "subjects", subject, subtopic, "lesson_plans.json"
+            self._subject_path(subject, subtopic), "lesson_plans.json"
+        )
+        return self._load_cached_json(
+            self._get_cache_key(subject, subtopic, "lessons"),
+            lessons_path,
+            subject,
+            subtopic,
         )
-        lessons_data = self._load_json_file(lessons_path)
-
-        if lessons_data:
-            self._cache[cache_key] = lessons_data
-
-        return lessons_data
 
     def load_videos(self, subject: str, subtopic: str) -> Optional[Dict[str, Any]]:
         """
@@ -224,13 +413,14 @@ class DataLoader:
         """
         cache_key = self._get_cache_key(subject, subtopic, "videos")
 
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        entry = self._cache_get(cache_key)
+        if entry is not None:
+            return entry[1]
 
         # VIDEO FEATURE DISABLED (temporary). Keeping original implementation
         # commented out below so it can be restored later.
         empty_payload: Dict[str, Any] = {"videos": []}
-        self._cache[cache_key] = empty_payload
+        self._cache_set(cache_key, empty_payload, None, subject, subtopic)
         return empty_payload
 
         # videos_path = os.path.join(
@@ -265,12 +455,19 @@ class DataLoader:
             List of allowed tags, empty list if not found
         """
         config = self.load_subject_config(subject)
-        if config:
+        if not config:
+            return []
+
+        # The cached config is replaced when its file changes, so an identity
+        # check is enough to know the lowercased tags are still current.
+        cached = self._subject_keywords.get(subject)
+        if cached is None or cached[0] is not config:
             # Support both old and new format during migration
             tags = config.get("allowed_tags", config.get("allowed_keywords", []))
             # Ensure all tags are lowercase
-            return [tag.lower() for tag in tags]
-        return []
+            cached = (config, tuple(map(str.lower, tags)))
+            self._subject_keywords[subject] = cached
+        return list(cached[1])
 
     def get_quiz_questions(self, subject: str, subtopic: str) -> List[Dict[str, Any]]:
         """
@@ -324,9 +521,61 @@ class DataLoader:
             )
         return f"{subject.title()} {subtopic.title()} Quiz"
 
+    def warm_cache(self, max_workers: int = 8) -> int:
+        """
+        Preload every discovered subject's documents into the cache.
+
+        Subject info and config are cached by discovery itself; subtopic files
+        are read and parsed on a thread pool, with results inserted into the
+        cache from the calling thread only.
+
+        Args:
+            max_workers: Number of loader threads
+
+        Returns:
+            Number of documents cached
+        """
+        jobs = []
+        warmed = 0
+        for subject in self.discover_subjects():
+            # Discovery only lists subjects whose info and config loaded.
+            config = self.load_subject_config(subject)
+            warmed += 2
+            for subtopic in config.get("subtopics", {}):
+                for file_type, filename in _WARM_SUBTOPIC_FILES:
+                    jobs.append(
+                        (
+                            self._get_cache_key(subject, subtopic, file_type),
+                            os.path.join(
+                                self._subject_path(subject, subtopic), filename
+                            ),
+                            subject,
+                            subtopic,
+                        )
+                    )
+
+        def load(job):
+            file_path = job[1]
+            signature = self._file_signature(file_path)
+            if signature is None:
+                return job, None, None
+            return job, signature, self._load_json_file(file_path, allow_missing=True)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for job, signature, data in executor.map(load, jobs):
+                if data:
+                    cache_key, _path, subject, subtopic = job
+                    self._cache_set(cache_key, data, signature, subject, subtopic)
+                    warmed += 1
+        return warmed
+
     def clear_cache(self):
         """Clear the internal cache."""
         self._cache.clear()
+        self._key_index.clear()
+        self._valid_subtopics.clear()
+        self._tag_indexes.clear()
+        self._subject_keywords.clear()
 
     def clear_cache_for_subject_subtopic(self, subject: str, subtopic: str):
         """
@@ -337,24 +586,19 @@ class DataLoader:
             subtopic: Subtopic name (e.g., "functions")
         """
         # Clear all cache entries for this subject/subtopic
-        cache_keys_to_remove = []
-        for key in self._cache.keys():
-            if key.startswith(f"{subject}_{subtopic}_"):
-                cache_keys_to_remove.append(key)
-
-        for key in cache_keys_to_remove:
-            del self._cache[key]
+        for key in self._key_index.pop((subject, subtopic), ()):
+            self._cache.pop(key, None)
+        self._valid_subtopics.pop((subject, subtopic), None)
+        self._tag_indexes.pop(subject, None)
 
     def clear_cache_for_subject(self, subject: str) -> None:
         """Clear all cache entries related to a subject."""
-        cache_keys_to_remove = [
-            key
-            for key in list(self._cache.keys())
-            if key == subject or key.startswith(f"{subject}_")
-        ]
-
-        for key in cache_keys_to_remove:
-            del self._cache[key]
+        for key in self._key_index.pop((subject, None), ()):
+            self._cache.pop(key, None)
+        for key in [key for key in self._valid_subtopics if key[0] == subject]:
+            del self._valid_subtopics[key]
+        self._tag_indexes.pop(subject, None)
+        self._subject_keywords.pop(subject, None)
 
     def validate_subject_subtopic(self, subject: str, subtopic: str) -> bool:
         """
@@ -367,23 +611,32 @@ class DataLoader:
         Returns:
             True if the combination exists, False otherwise
         """
-        # Check if the directory structure exists
-        subtopic_path = os.path.join(self.data_root, "subjects", subject, subtopic)
-        if not os.path.exists(subtopic_path):
-            return False
+        # Positive results are trusted briefly to avoid a stat storm on hot
+        # routes; negative results are always re-checked so new content shows up.
+        key = (subject, subtopic)
+        now = time.monotonic()
+        expires_at = self._valid_subtopics.get(key)
+        if expires_at is not None and expires_at > now:
+            return True
 
-        # Consider the subtopic valid if any known data file exists
-        candidate_files = [
-            "quiz_data.json",
-            "lesson_plans.json",
-            "question_pool.json",
-            "videos.json",
-        ]
-        for fname in candidate_files:
-            if os.path.exists(os.path.join(subtopic_path, fname)):
-                return True
+        if self._subtopic_has_content(subject, subtopic):
+            self._valid_subtopics[key] = now + self.VALIDATION_TTL_SECONDS
+            self._valid_subtopics.move_to_end(key)
+            while len(self._valid_subtopics) > self.CACHE_MAX_ENTRIES:
+                self._valid_subtopics.popitem(last=False)
+            return True
+
+        self._valid_subtopics.pop(key, None)
         return False
 
+    def _subtopic_has_content(self, subject: str, subtopic: str) -> bool:
+        """Return True when the subtopic directory holds a known data file."""
+        try:
+            with os.scandir(self._subject_path(subject, subtopic)) as entries:
+                return any(entry.name in _SUBTOPIC_DATA_FILES for entry in entries)
+        except OSError:
+            return False
+
     def find_remedial_lessons_by_tags(
         self, subject: str, target_tags: List[str]
     ) -> List[Dict[str, Any]]:
@@ -450,59 +703,99 @@ class DataLoader:
         Returns:
             List of matching lessons with metadata
         """
-        matching_lessons = []
+        target_tags_set = _intern_tags(target_tags)
+        wanted_type = lesson_type.lower() if lesson_type else None
 
         try:
-            # Get all subtopics for the subject
-            subject_config = self.load_subject_config(subject)
-            if not subject_config or "subtopics" not in subject_config:
-                return matching_lessons
-
-            # Search through all subtopics for lessons
-            for subtopic_id in subject_config["subtopics"].keys():
-                lesson_plans = self.load_lesson_plans(subject, subtopic_id)
-                if not lesson_plans or "lessons" not in lesson_plans:
-                    continue
-
-                # Check each lesson in the subtopic
-                for lesson_id, lesson_data in lesson_plans["lessons"].items():
-                    # Filter by lesson type if specified
-                    if (
-                        lesson_type
-                        and lesson_data.get("type", "").lower() != lesson_type.lower()
-                    ):
-                        continue
-
-                    lesson_tags = set(lesson_data.get("tags", []))
-                    target_tags_set = set(target_tags)
-
-                    # If any lesson tags match target tags
-                    if not lesson_tags.isdisjoint(target_tags_set):
-                        matching_lessons.append(
-                            {
-                                "subject": subject,
-                                "subtopic": subtopic_id,
-                                "lesson_id": lesson_id,
-                                "title": lesson_data.get("title", ""),
-                                "type": lesson_data.get("type", ""),
-                                "tags": lesson_data.get("tags", []),
-                                "order": lesson_data.get("order", 999),
-                                "matching_tags": list(
-                                    lesson_tags.intersection(target_tags_set)
-                                ),
-                            }
-                        )
-
+            tag_index = self._get_lesson_tag_index(subject)
         except Exception as e:
             if current_app:
                 current_app.logger.error(f"Error finding lessons by tags: {e}")
+            return []
+
+        # Union the index buckets of every target tag, de-duplicating lessons.
+        matches = {}
+        for tag in target_tags_set:
+            for record in tag_index.get(tag, ()):
+                rank, _lesson, type_key, _tags = record
+                if wanted_type is None or type_key == wanted_type:
+                    matches[rank] = record
+
+        # Ranks were assigned in display order when the index was built.
+        ordered = map(matches.__getitem__, sorted(matches))
+        return [
+            {**lesson, "matching_tags": list(tags.intersection(target_tags_set))}
+            for _rank, lesson, _type_key, tags in ordered
+        ]
 
-        # Sort lessons by order field (lower numbers first), then by lesson_id for stability
-        matching_lessons.sort(
-            key=lambda x: (x.get("order", 999), x.get("lesson_id", ""))
+    def _get_lesson_tag_index(self, subject: str) -> Dict[str, List[_TagIndexRecord]]:
+        """
+        Return the subject's tag -> lessons index, rebuilding it when stale.
+
+        The index is keyed on the subject's subtopic list and the signatures of
+        their lesson_plans.json files, so any edit triggers a rebuild.
+        """
+        subject_config = self.load_subject_config(subject)
+        if not subject_config or "subtopics" not in subject_config:
+            return {}
+
+        subtopic_ids = tuple(subject_config["subtopics"].keys())
+        signature = (
+            subtopic_ids,
+            tuple(
+                self._file_signature(
+                    os.path.join(
+                        self._subject_path(subject, subtopic_id), "lesson_plans.json"
+                    )
+                )
+                for subtopic_id in subtopic_ids
+            ),
         )
+        cached = self._tag_indexes.get(subject)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        entries = []
+        for subtopic_id in subtopic_ids:
+            lesson_plans = self.load_lesson_plans(subject, subtopic_id)
+            if not lesson_plans or "lessons" not in lesson_plans:
+                continue
+
+            for lesson_id, lesson_data in lesson_plans["lessons"].items():
+                lesson = {
+                    "subject": subject,
+                    "subtopic": subtopic_id,
+                    "lesson_id": lesson_id,
+                    "title": lesson_data.get("title", ""),
+                    "type": lesson_data.get("type", ""),
+                    "tags": lesson_data.get("tags", []),
+                    "order": lesson_data.get("order", 999),
+                }
+                # Interned tags make the bucket lookups and intersections below
+                # pointer comparisons, and share one string per distinct tag.
+                tags = _intern_tags(lesson["tags"])
+                entries.append(
+                    (
+                        lesson["order"],
+                        lesson_id,
+                        lesson,
+                        (lesson["type"] or "").lower(),
+                        tags,
+                    )
+                )
+
+        # Sort lessons by order field (lower numbers first), then by lesson_id for
+        # stability; the stable sort keeps remaining ties in source-file order.
+        entries.sort(key=itemgetter(0, 1))
+        tag_index: Dict[str, List[_TagIndexRecord]] = defaultdict(list)
+        for rank, (_order, _lesson_id, lesson, type_key, tags) in enumerate(entries):
+            record = (rank, lesson, type_key, tags)
+            for tag in tags:
+                tag_index[tag].append(record)
 
-        return matching_lessons
+        tag_index = dict(tag_index)
+        self._tag_indexes[subject] = (signature, tag_index)
+        return tag_index
 
     def discover_subjects(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -513,34 +806,32 @@ class DataLoader:
             Dictionary of subjects in the same format as subjects.json
         """
         subjects = {}
-        subjects_dir = os.path.join(self.data_root, "subjects")
+        subjects_dir = self._subjects_root
+        logger = _app_logger()
 
         if not os.path.exists(subjects_dir):
-            if current_app:
-                current_app.logger.warning(
-                    f"Subjects directory not found: {subjects_dir}"
-                )
+            if logger:
+                logger.warning(f"Subjects directory not found: {subjects_dir}")
             return subjects
 
         try:
             # Scan all directories in the subjects folder
-            for item in os.listdir(subjects_dir):
-                subject_path = os.path.join(subjects_dir, item)
+            with os.scandir(subjects_dir) as entries:
+                subject_dirs = [entry for entry in entries if entry.is_dir()]
 
-                # Skip if not a directory
-                if not os.path.isdir(subject_path):
-                    continue
-
-                # Look for subject_info.json
-                subject_info_path = os.path.join(subject_path, "subject_info.json")
-                subject_config_path = os.path.join(subject_path, "subject_config.json")
+            for entry in subject_dirs:
+                item = entry.name
+                subject_path = entry.path
 
                 # Subject must have both files to be valid
-                if os.path.exists(subject_info_path) and os.path.exists(
-                    subject_config_path
+                file_names = _entry_names(subject_path)
+                if (
+                    "subject_info.json" in file_names
+                    and "subject_config.json" in file_names
                 ):
-                    subject_info = self._load_json_file(subject_info_path)
-                    subject_config = self._load_json_file(subject_config_path)
+                    # Loaded through the cache so later lookups reuse them.
+                    subject_info = self.load_subject_info(item)
+                    subject_config = self.load_subject_config(item)
 
                     if subject_info and subject_config:
                         # Calculate subtopic count
@@ -556,24 +847,24 @@ class DataLoader:
                             ),
                         }
 
-                        if current_app:
-                            current_app.logger.info(
+                        if logger:
+                            logger.info(
                                 f"Discovered subject: {item} - {subject_info.get('name', 'Unknown')}"
                             )
                     else:
-                        if current_app:
-                            current_app.logger.warning(
+                        if logger:
+                            logger.warning(
                                 f"Invalid subject files in directory: {item}"
                             )
                 else:
-                    if current_app:
-                        current_app.logger.debug(
+                    if logger:
+                        logger.debug(
                             f"Skipping directory (missing required files): {item}"
                         )
 
         except Exception as e:
-            if current_app:
-                current_app.logger.error(f"Error discovering subjects: {e}")
+            if logger:
+                logger.error(f"Error discovering subjects: {e}")
 
         return subjects
 
@@ -589,88 +880,61 @@ class DataLoader:
         """
         try:
             subject_config_path = os.path.join(
-                self.data_root, "subjects", subject, "subject_config.json"
+                self._subject_path(subject), "subject_config.json"
             )
 
             if not os.path.exists(subject_config_path):
                 return False
 
             # Load current config
-            with open(subject_config_path, "r", encoding="utf-8") as f:
-                config = json.load(f)
+            config = _load_document(subject_config_path)
 
             # Collect existing tags from various sources
             all_tags = set()
 
             # Add existing allowed_keywords
             existing_keywords = config.get("allowed_keywords", [])
-            all_tags.update([tag.lower() for tag in existing_keywords])
+            all_tags.update(map(str.lower, existing_keywords))
 
             # Add existing allowed_tags if any
             existing_tags = config.get("allowed_tags", [])
-            all_tags.update([tag.lower() for tag in existing_tags])
+            all_tags.update(map(str.lower, existing_tags))
 
             # Scan all subtopics for remedial lesson and question tags
-            subject_dir = os.path.join(self.data_root, "subjects", subject)
-            if os.path.exists(subject_dir):
-                for item in os.listdir(subject_dir):
-                    item_path = os.path.join(subject_dir, item)
-                    if os.path.isdir(item_path) and item not in ["__pycache__"]:
-                        # Check remedial lesson plans
-                        lesson_plans_path = os.path.join(item_path, "lesson_plans.json")
-                        if os.path.exists(lesson_plans_path):
-                            try:
-                                with open(
-                                    lesson_plans_path, "r", encoding="utf-8"
-                                ) as f:
-                                    lesson_data = json.load(f)
-                                    lessons = lesson_data.get("lessons", {})
-                                    for lesson_id, lesson_content in lessons.items():
-                                        lesson_tags = lesson_content.get("tags", [])
-                                        all_tags.update(
-                                            [tag.lower() for tag in lesson_tags]
-                                        )
-                            except Exception as e:
-                                if current_app:
-                                    current_app.logger.warning(
-                                        f"Error reading remedial lesson plans for {subject}/{item}: {e}"
-                                    )
-
-                        # Check quiz data
-                        quiz_data_path = os.path.join(item_path, "quiz_data.json")
-                        if os.path.exists(quiz_data_path):
-                            try:
-                                with open(quiz_data_path, "r", encoding="utf-8") as f:
-                                    quiz_data = json.load(f)
-                                    questions = quiz_data.get("questions", [])
-                                    for question in questions:
-                                        question_tags = question.get("tags", [])
-                                        all_tags.update(
-                                            [tag.lower() for tag in question_tags]
-                                        )
-                            except Exception as e:
-                                if current_app:
-                                    current_app.logger.warning(
-                                        f"Error reading quiz data for {subject}/{item}: {e}"
-                                    )
-
-                        # Check question pool
-                        pool_data_path = os.path.join(item_path, "question_pool.json")
-                        if os.path.exists(pool_data_path):
-                            try:
-                                with open(pool_data_path, "r", encoding="utf-8") as f:
-                                    pool_data = json.load(f)
-                                    questions = pool_data.get("questions", [])
-                                    for question in questions:
-                                        question_tags = question.get("tags", [])
-                                        all_tags.update(
-                                            [tag.lower() for tag in question_tags]
-                                        )
-                            except Exception as e:
-                                if current_app:
-                                    current_app.logger.warning(
-                                        f"Error reading question pool for {subject}/{item}: {e}"
-                                    )
+            parser = simdjson.Parser() if simdjson is not None else None
+            subject_dir = self._subject_path(subject)
+            with os.scandir(subject_dir) as entries:
+                subtopic_dirs = [
+                    entry
+                    for entry in entries
+                    if entry.is_dir() and entry.name != "__pycache__"
+                ]
+
+            sources = []
+            for entry in subtopic_dirs:
+                file_names = _entry_names(entry.path)
+                for filename, collection, label in _TAG_SOURCES:
+                    if filename in file_names:
+                        file_path = os.path.join(entry.path, filename)
+                        sources.append((entry.name, file_path, collection, label))
+
+            # Prefetch the next file while the current one is being parsed.
+            for index, (item, file_path, collection, label) in enumerate(sources):
+                if index + 1 < len(sources):
+                    _prefetch(sources[index + 1][1])
+                try:
+                    raw = _read_bytes(file_path)
+                    for tags in _iter_item_tags(raw, collection, parser):
+                        all_tags.update(map(str.lower, tags))
+                except Exception as e:
+                    # A partial scan would drop tags from allowed_tags, so
+                    # leave the config untouched instead.
+                    if current_app:
+                        current_app.logger.warning(
+                            f"Error reading {label} for {subject}/{item}: {e}; "
+                            "subject config left unchanged"
+                        )
+                    return False
 
             # Update config with new format
             config["allowed_tags"] = sorted(list(all_tags))
@@ -680,8 +944,8 @@ class DataLoader:
                 del config["allowed_keywords"]
 
             # Save updated config
-            with open(subject_config_path, "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            with open(subject_config_path, "wb") as f:
+                f.write(_dumps_pretty(config))
 
             if current_app:
                 current_app.logger.info(